@@ -5,6 +5,45 @@ SCIP Parser - 获取所有符号定义示例
 包括函数、方法、类、接口等。
 """
 
+import sys
+from collections import namedtuple
+
+from scip_parser.core.types import SymbolKind
+
+# 每个定义一行，使用 namedtuple 代替 dict，减少内存分配并支持属性访问
+Definition = namedtuple(
+    "Definition",
+    "symbol display_name kind kind_name document language documentation",
+)
+
+# 预先计算 SymbolKind -> 名称，避免每行访问枚举的 .name 描述符
+_KIND_NAME = {k: k.name for k in SymbolKind}
+
+
+class Definitions:
+    """定义集合
+
+    持有全部定义行，并在构建时一次性建立按类型分桶的索引，
+    使后续过滤只需 O(1) 字典查找，而不是每次线性扫描。
+    """
+
+    __slots__ = ("rows", "by_kind")
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.by_kind = {}
+        for d in rows:
+            self.by_kind.setdefault(d.kind, []).append(d)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, item):
+        return self.rows[item]
+
 
 def get_all_definitions(index):
     """获取所有符号定义
@@ -13,54 +52,66 @@ def get_all_definitions(index):
         index: SCIP Index 对象
 
     Returns:
-        包含所有定义信息的列表，每个元素是一个字典
+        Definitions 集合，可像列表一样迭代，每个元素是一个 Definition
     """
-    definitions = []
+    # 总数已知: 一次分配结果列表，按文档切片填充，避免逐行 append 扩容
+    definitions = [None] * sum(len(document.symbols) for document in index.documents)
+    i = 0
 
     # 遍历所有文档
     for document in index.documents:
+        # 文档级字段在内层循环外绑定一次，并驻留以便所有行共享同一字符串对象
+        rp = sys.intern(document.relative_path)
+        lang = sys.intern(document.language)
+        n = len(document.symbols)
         # document.symbols 是一个字典，包含了在该文档中定义的所有符号
-        for symbol_str, symbol_info in document.symbols.items():
-            definitions.append(
-                {
-                    "symbol": symbol_str,
-                    "display_name": symbol_info.display_name,
-                    "kind": symbol_info.kind,  # SymbolKind 枚举值
-                    "kind_name": symbol_info.kind.name,  # 种类名称
-                    "document": document.relative_path,
-                    "language": document.language,
-                    "documentation": symbol_info.documentation,
-                }
+        definitions[i : i + n] = [
+            Definition(
+                s,
+                si.display_name,
+                si.kind,  # SymbolKind 枚举值
+                _KIND_NAME[si.kind],  # 种类名称
+                rp,
+                lang,
+                si.documentation,
             )
+            for s, si in document.symbols.items()
+        ]
+        i += n
 
-    return definitions
+    return Definitions(definitions)
 
 
 def filter_definitions_by_kind(definitions, kind):
     """按符号类型过滤定义
 
     Args:
-        definitions: get_all_definitions() 返回的定义列表
+        definitions: get_all_definitions() 返回的 Definitions 集合或定义列表
         kind: SymbolKind 枚举值（如 SymbolKind.Function, SymbolKind.Method）
 
     Returns:
         过滤后的定义列表
     """
-    return [d for d in definitions if d["kind"] == kind]
+    if isinstance(definitions, Definitions):
+        return list(definitions.by_kind.get(kind, ()))
+    return [d for d in definitions if d.kind == kind]
 
 
 def filter_definitions_by_kinds(definitions, kinds):
     """按多个符号类型过滤定义
 
     Args:
-        definitions: get_all_definitions() 返回的定义列表
+        definitions: get_all_definitions() 返回的 Definitions 集合或定义列表
         kinds: SymbolKind 枚举值列表
 
     Returns:
-        过滤后的定义列表
+        过滤后的定义列表 (保持原有顺序)
     """
     kind_set = set(kinds)
-    return [d for d in definitions if d["kind"] in kind_set]
+    if isinstance(definitions, Definitions) and len(kind_set) == 1:
+        # 单一类型: 直接复用类型桶，桶内即为文档顺序
+        return list(definitions.by_kind.get(next(iter(kind_set)), ()))
+    return [d for d in definitions if d.kind in kind_set]
 
 
 def print_definitions(definitions, show_documentation=False):
@@ -74,13 +125,13 @@ def print_definitions(definitions, show_documentation=False):
     print("=" * 80)
 
     for i, definition in enumerate(definitions, 1):
-        print(f"\n{i}. {definition['display_name']}")
-        print(f"   符号: {definition['symbol']}")
-        print(f"   类型: {definition['kind_name']}")
-        print(f"   位置: {definition['document']}")
+        print(f"\n{i}. {definition.display_name}")
+        print(f"   符号: {definition.symbol}")
+        print(f"   类型: {definition.kind_name}")
+        print(f"   位置: {definition.document}")
 
-        if show_documentation and definition["documentation"]:
-            print(f"   文档: {' '.join(definition['documentation'])}")
+        if show_documentation and definition.documentation:
+            print(f"   文档: {' '.join(definition.documentation)}")
 
 
 def example_find_all_functions():
@@ -183,7 +234,7 @@ from collections import defaultdict
 by_kind = defaultdict(list)
 
 for d in definitions:
-    by_kind[d['kind_name']].append(d)
+    by_kind[d.kind_name].append(d)
 
 # 打印每种类型的数量
 for kind_name, items in sorted(by_kind.items()):
@@ -193,7 +244,7 @@ for kind_name, items in sorted(by_kind.items()):
 if 'Function' in by_kind:
     print("\\n所有函数:")
     for func in by_kind['Function']:
-        print(f"  - {func['display_name']} 在 {func['document']}")
+        print(f"  - {func.display_name} 在 {func.document}")
     """)
 
 
@@ -247,14 +298,14 @@ definitions = get_all_definitions(index)
 
 # 对于每个定义，查找它的所有出现位置（定义 + 引用）
 for definition in definitions[:10]:  # 只看前10个
-    symbol = definition['symbol']
+    symbol = definition.symbol
     occurrences = index.get_symbol_occurrences(symbol)
 
     # 统计定义和引用数量
     definition_count = sum(1 for occ in occurrences if occ.is_definition)
     reference_count = len(occurrences) - definition_count
 
-    print(f"\\n{definition['display_name']}:")
+    print(f"\\n{definition.display_name}:")
     print(f"  定义: {definition_count} 个")
     print(f"  引用: {reference_count} 个")
 
@@ -22,50 +22,226 @@ SCIP 符号定义查询工具
 """
 
 import argparse
+import gzip
+import hashlib
+import os
+import pickle
 import sys
-from collections import defaultdict
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import compress, groupby, islice
+from operator import attrgetter
 from pathlib import Path
 
 # 添加项目根目录到 Python 路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from scip_parser import SCIPParser
+# 每个定义一行，使用 namedtuple 代替 dict，减少内存分配并支持属性访问
+Definition = namedtuple(
+    "Definition",
+    "symbol display_name kind kind_name document language language_lc documentation relationships",
+)
 
 
-def get_all_definitions(index):
-    """获取索引中所有符号定义
+class _KindNames(dict):
+    """SymbolKind -> 名称缓存，首次查找时填充
+
+    避免每行访问枚举的 .name 描述符，同时无需在模块导入时加载 scip_parser。
+    """
+
+    def __missing__(self, kind):
+        name = self[kind] = kind.name
+        return name
+
+
+_KIND_NAME = _KindNames()
+
+# C 实现的字段访问器，供过滤谓词使用，避免每行进入 Python 帧
+_get_kind = attrgetter("kind")
+_get_language_lc = attrgetter("language_lc")
+
+# 文档数超过该阈值时才启用多进程提取，避免小索引承担进程池启动开销
+_PARALLEL_MIN_DOCUMENTS = 200
+
+# print_definitions 每累积这么多行输出才写一次 stdout
+_PRINT_CHUNK_ROWS = 1024
+
+
+@lru_cache(maxsize=64)
+def _canonical_kinds(kind_names):
+    """将排序后的 SymbolKind 名称元组转换为枚举值 frozenset，未知名称被忽略"""
+    from scip_parser.core.types import SymbolKind
+
+    kind_by_name = SymbolKind.__members__
+    return frozenset(kind_by_name[n] for n in kind_names if n in kind_by_name)
+
+
+def _kinds_from_names(kind_names):
+    """获取名称列表对应的枚举值集合 (同一组名称只构建一次)"""
+    return _canonical_kinds(tuple(sorted(kind_names)))
+
+
+class Definitions:
+    """定义集合
+
+    持有全部定义行，并在构建时一次性建立按类型/语言分桶的索引，
+    过滤、分组和统计直接复用这些桶，不再重复扫描全部定义。
+    """
+
+    __slots__ = ("rows", "by_kind", "by_kind_name", "by_language")
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.by_kind = {}
+        self.by_kind_name = {}
+        self.by_language = {}
+        for d in rows:
+            self.by_kind.setdefault(d.kind, []).append(d)
+            self.by_kind_name.setdefault(d.kind_name, []).append(d)
+            self.by_language.setdefault(d.language_lc, []).append(d)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, item):
+        return self.rows[item]
+
+
+def _extract_rows(relative_path, language, symbols):
+    """提取单个文档中的所有定义 (顶层函数，可被多进程 pickle)
+
+    只接收文档路径、语言和符号字典，并行时无需把整个 Document
+    (全部 occurrence 和文本) 序列化给工作进程。
+
+    Args:
+        relative_path: 文档相对路径
+        language: 文档语言
+        symbols: 文档中定义的符号字典
+
+    Returns:
+        Definition 列表
+    """
+    # 路径和语言在大量行之间重复: 驻留后所有行共享同一个字符串对象
+    rp = sys.intern(relative_path)
+    lang = sys.intern(language)
+    # 每个文档只做一次小写转换，供语言过滤直接比较
+    lang_lc = sys.intern(lang.lower())
+    return [
+        Definition(
+            s,
+            si.display_name,
+            si.kind,
+            _KIND_NAME[si.kind],
+            rp,
+            lang,
+            lang_lc,
+            si.documentation,
+            si.relationships,
+        )
+        for s, si in symbols.items()
+    ]
+
+
+def _extract_from_document(document):
+    """提取单个文档中的所有定义
+
+    Args:
+        document: SCIP Document 对象
+
+    Returns:
+        Definition 列表
+    """
+    return _extract_rows(document.relative_path, document.language, document.symbols)
+
+
+def iter_all_definitions(index):
+    """逐个产出索引中的符号定义
+
+    以生成器方式遍历，调用方可以配合 islice 提前终止，
+    避免在只需要前 N 个结果时构建完整列表。
+
+    Args:
+        index: SCIP Index 对象
+
+    Yields:
+        Definition
+    """
+    for document in index.documents:
+        yield from _extract_from_document(document)
+
+
+def count_definitions(index):
+    """统计定义数量，不构建任何定义行
 
     Args:
         index: SCIP Index 对象
 
     Returns:
-        定义字典列表
+        定义总数
     """
-    definitions = []
+    return sum(len(document.symbols) for document in index.documents)
 
+
+def kind_counts(index):
+    """按符号类型统计定义数量，不构建任何定义行
+
+    Args:
+        index: SCIP Index 对象
+
+    Returns:
+        Counter，key 为类型名，value 为数量
+    """
+    counts = Counter()
     for document in index.documents:
-        for symbol_str, symbol_info in document.symbols.items():
-            definitions.append(
-                {
-                    "symbol": symbol_str,
-                    "display_name": symbol_info.display_name,
-                    "kind": symbol_info.kind,
-                    "kind_name": symbol_info.kind.name,
-                    "document": document.relative_path,
-                    "language": document.language,
-                    "documentation": symbol_info.documentation,
-                    "relationships": symbol_info.relationships,
-                }
-            )
-
-    return definitions
+        counts.update(si.kind for si in document.symbols.values())
+    return Counter({_KIND_NAME[kind]: count for kind, count in counts.items()})
+
+
+def get_all_definitions(index, jobs=1):
+    """获取索引中所有符号定义
+
+    各文档的提取互不依赖，文档数较多时按文档分块交给进程池并行处理。
+
+    Args:
+        index: SCIP Index 对象
+        jobs: 工作进程数 (默认 1 表示禁用并行; None 表示按 CPU 核数)
+
+    Returns:
+        Definitions 集合
+    """
+    documents = index.documents
+    if jobs == 1 or len(documents) <= _PARALLEL_MIN_DOCUMENTS:
+        # 总数已知: 一次分配结果列表，按文档切片填充，避免逐行 append 扩容
+        definitions = [None] * count_definitions(index)
+        i = 0
+        for document in documents:
+            rows = _extract_from_document(document)
+            definitions[i : i + len(rows)] = rows
+            i += len(rows)
+        return Definitions(definitions)
+
+    definitions = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for rows in executor.map(
+            _extract_rows,
+            [document.relative_path for document in documents],
+            [document.language for document in documents],
+            [document.symbols for document in documents],
+            chunksize=32,
+        ):
+            definitions.extend(rows)
+    return Definitions(definitions)
 
 
 def filter_by_kinds(definitions, kind_names):
     """按符号类型过滤
 
     Args:
-        definitions: 定义列表
+        definitions: 定义列表或 Definitions 集合
         kind_names: SymbolKind 名称列表
 
     Returns:
@@ -74,15 +250,22 @@ def filter_by_kinds(definitions, kind_names):
     if not kind_names:
         return definitions
 
-    kind_set = set(kind_names)
-    return [d for d in definitions if d["kind_name"] in kind_set]
+    if isinstance(definitions, Definitions):
+        if len(set(kind_names)) == 1:
+            # 单一类型: 直接复用类型桶，桶内即为文档顺序
+            return list(definitions.by_kind_name.get(kind_names[0], ()))
+        # 多个类型: 按集合过滤全部行，结果保持文档顺序
+        definitions = definitions.rows
+
+    kind_set = _kinds_from_names(kind_names)
+    return list(compress(definitions, map(kind_set.__contains__, map(_get_kind, definitions))))
 
 
 def filter_by_language(definitions, language):
     """按编程语言过滤
 
     Args:
-        definitions: 定义列表
+        definitions: 定义列表或 Definitions 集合
         language: 编程语言名称
 
     Returns:
@@ -91,46 +274,130 @@ def filter_by_language(definitions, language):
     if not language:
         return definitions
 
-    return [d for d in definitions if d["language"].lower() == language.lower()]
+    if isinstance(definitions, Definitions):
+        return list(definitions.by_language.get(language.lower(), ()))
+
+    language = language.lower()
+    return list(compress(definitions, map(language.__eq__, map(_get_language_lc, definitions))))
+
+
+def filter_and_group(definitions, kind_names=None, language=None):
+    """单次遍历完成类型/语言过滤和按类型分组
+
+    对 Definitions 集合按单一类型过滤时只遍历该类型桶；
+    分组结果同时提供各类型的数量，无需再次扫描。
+
+    Args:
+        definitions: 定义列表或 Definitions 集合
+        kind_names: SymbolKind 名称列表 (None 或空表示不过滤)
+        language: 编程语言名称 (None 或空表示不过滤)
+
+    Returns:
+        (过滤后的定义列表, 按类型名分组的字典)
+    """
+    if not kind_names and not language:
+        return definitions, group_by_kind(definitions)
+
+    kind_set = None
+    if kind_names:
+        if isinstance(definitions, Definitions) and len(set(kind_names)) == 1:
+            # 单一类型: 只遍历该类型桶 (桶内即为文档顺序)
+            definitions = definitions.by_kind_name.get(kind_names[0], ())
+        else:
+            # 多个类型: 按集合过滤全部行，与 --limit 流式路径一样保持文档顺序
+            kind_set = _kinds_from_names(kind_names)
+    language = language.lower() if language else None
+
+    filtered = []
+    grouped = {}
+    for d in definitions:
+        if language is not None and d.language_lc != language:
+            continue
+        if kind_set is not None and d.kind not in kind_set:
+            continue
+        filtered.append(d)
+        grouped.setdefault(d.kind_name, []).append(d)
+    return filtered, grouped
 
 
 def group_by_kind(definitions):
     """按符号类型分组
 
     Args:
-        definitions: 定义列表
+        definitions: 定义列表或 Definitions 集合
 
     Returns:
         字典，key 为类型名，value 为定义列表
     """
-    grouped = defaultdict(list)
-    for d in definitions:
-        grouped[d["kind_name"]].append(d)
-    return dict(grouped)
+    if isinstance(definitions, Definitions):
+        return definitions.by_kind_name
+
+    # 稳定排序后一次 groupby，组内保持原有顺序
+    get_kind_name = attrgetter("kind_name")
+    return {
+        kind_name: list(group)
+        for kind_name, group in groupby(sorted(definitions, key=get_kind_name), key=get_kind_name)
+    }
+
+
+def _truncate_docs(parts, limit=100):
+    """拼接文档片段，超过 limit 个字符时截断并追加省略号
+
+    只拼接足以超过 limit 的前若干片段，避免为长文档构建完整字符串。
+
+    Args:
+        parts: 文档片段序列
+        limit: 最大字符数
+
+    Returns:
+        截断后的文档文本
+    """
+    out = []
+    n = -1  # 拼接后的长度 (含分隔空格)
+    for p in parts:
+        out.append(p)
+        n += len(p) + 1
+        if n > limit:
+            break
+    text = " ".join(out)
+    if len(text) > limit:
+        return text[: limit - 3] + "..."
+    return text
 
 
 def print_definitions(definitions, show_doc=False, show_symbol=False):
     """打印定义列表
 
+    每行定义拼接为一个字符串，按块批量写入 stdout，减少 write 调用次数。
+
     Args:
         definitions: 定义列表
         show_doc: 是否显示文档
         show_symbol: 是否显示完整符号字符串
     """
+    write = sys.stdout.write
+    buf = []
     for i, d in enumerate(definitions, 1):
-        print(f"\n{i}. {d['display_name']}")
-        print(f"   类型: {d['kind_name']}")
-        print(f"   位置: {d['document']}")
-        print(f"   语言: {d['language']}")
+        row = (
+            f"\n{i}. {d.display_name}\n"
+            f"   类型: {d.kind_name}\n"
+            f"   位置: {d.document}\n"
+            f"   语言: {d.language}\n"
+        )
 
         if show_symbol:
-            print(f"   符号: {d['symbol']}")
+            row += f"   符号: {d.symbol}\n"
+
+        if show_doc and d.documentation:
+            row += f"   文档: {_truncate_docs(d.documentation)}\n"
+
+        buf.append(row)
+        if len(buf) >= _PRINT_CHUNK_ROWS:
+            write("".join(buf))
+            buf.clear()
 
-        if show_doc and d["documentation"]:
-            doc_text = " ".join(d["documentation"])
-            if len(doc_text) > 100:
-                doc_text = doc_text[:97] + "..."
-            print(f"   文档: {doc_text}")
+    if buf:
+        write("".join(buf))
 
 
 def print_grouped_definitions(grouped, show_doc=False, show_symbol=False):
@@ -157,17 +424,84 @@ def print_statistics(definitions):
         definitions: 定义列表
     """
     grouped = group_by_kind(definitions)
+    print_kind_counts({kind_name: len(items) for kind_name, items in grouped.items()})
+
+
+def print_kind_counts(counts):
+    """打印各符号类型的数量统计
+
+    Args:
+        counts: 字典，key 为类型名，value 为数量
+    """
+    total = sum(counts.values())
 
     print(f"\n{'=' * 80}")
-    print(f"统计信息 (共 {len(definitions)} 个符号定义)")
+    print(f"统计信息 (共 {total} 个符号定义)")
     print("=" * 80)
 
-    for kind_name in sorted(grouped.keys()):
-        count = len(grouped[kind_name])
-        percentage = (count / len(definitions)) * 100
+    for kind_name in sorted(counts.keys()):
+        count = counts[kind_name]
+        percentage = (count / total) * 100
         print(f"{kind_name:30s}: {count:5d} ({percentage:5.1f}%)")
 
 
+def _index_cache_path(scip_file):
+    """计算 SCIP 文件对应的解析缓存路径
+
+    缓存键由绝对路径、修改时间和文件大小组成，源文件变化后自动失效。
+
+    Args:
+        scip_file: SCIP 文件路径
+
+    Returns:
+        缓存文件路径
+    """
+    st = os.stat(scip_file)
+    key = hashlib.blake2b(
+        f"{os.path.abspath(scip_file)}|{st.st_mtime_ns}|{st.st_size}".encode(), digest_size=16
+    ).hexdigest()
+    cache_root = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return cache_root / "scip_parser" / f"{key}.pkl.gz"
+
+
+def load_index(scip_file, use_cache=True, rebuild_cache=False):
+    """解析 SCIP 文件，优先复用磁盘上的解析缓存
+
+    Args:
+        scip_file: SCIP 文件路径
+        use_cache: 是否读写解析缓存
+        rebuild_cache: 是否忽略已有缓存并重新生成
+
+    Returns:
+        Index 对象
+    """
+    cache_path = _index_cache_path(scip_file) if use_cache else None
+
+    if cache_path is not None and not rebuild_cache and cache_path.exists():
+        try:
+            with gzip.open(cache_path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            pass  # 缓存损坏或与当前版本不兼容，回退到重新解析
+
+    # 延迟导入: --help 和参数错误路径无需加载 protobuf 与类型系统
+    from scip_parser import SCIPParser
+
+    index = SCIPParser(enable_indexing=True).parse_file(scip_file)
+
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with gzip.open(tmp_path, "wb", compresslevel=1) as f:
+                pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # 缓存写入失败不影响本次查询
+
+    return index
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="查询 SCIP 文件中的符号定义",
@@ -189,6 +523,15 @@ def main():
     parser.add_argument("--show-symbol", "-s", action="store_true", help="显示完整符号字符串")
     parser.add_argument("--stats", "-S", action="store_true", help="显示统计信息")
     parser.add_argument("--limit", "-n", type=int, default=None, help="限制显示数量")
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help=f"提取定义的并行进程数 (默认 1 不并行, 文档数超过 {_PARALLEL_MIN_DOCUMENTS} 时生效)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="不读写解析缓存")
+    parser.add_argument("--rebuild-cache", action="store_true", help="忽略已有缓存，重新解析并写入")
 
     args = parser.parse_args()
 
@@ -199,10 +542,11 @@ def main():
 
     print(f"正在解析 SCIP 文件: {args.scip_file}")
 
-    # 解析 SCIP 文件
-    src = SCIPParser(enable_indexing=True)
+    # 解析 SCIP 文件 (命中缓存时直接加载)
     try:
-        index = src.parse_file(args.scip_file)
+        index = load_index(
+            args.scip_file, use_cache=not args.no_cache, rebuild_cache=args.rebuild_cache
+        )
     except Exception as e:
         print(f"错误: 解析 SCIP 文件失败: {e}", file=sys.stderr)
         sys.exit(1)
@@ -211,27 +555,39 @@ def main():
     print(f"  文档数: {len(index.documents)}")
     print(f"  符号总数: {len(index.list_symbols())}")
 
-    # 获取所有定义
-    definitions = get_all_definitions(index)
-    print(f"  定义数: {len(definitions)}")
+    print(f"  定义数: {count_definitions(index)}")
 
-    # 应用过滤条件
-    definitions = filter_by_kinds(definitions, args.kinds)
-    definitions = filter_by_language(definitions, args.language)
+    if args.stats and not (args.kinds or args.language or args.limit):
+        # 只需要各类型数量: 直接计数，跳过定义行的构建
+        print_kind_counts(kind_counts(index))
+        print(f"\n{'=' * 80}\n")
+        return
 
-    if args.kinds:
-        print(f"  过滤后: {len(definitions)} 个定义")
-
-    # 限制数量
     if args.limit:
-        definitions = definitions[: args.limit]
+        # 只需要前 N 个: 流式过滤，取够后立即停止遍历
+        definitions = iter_all_definitions(index)
+        if args.kinds:
+            kind_set = _kinds_from_names(args.kinds)
+            definitions = (d for d in definitions if d.kind in kind_set)
+        if args.language:
+            language = args.language.lower()
+            definitions = (d for d in definitions if d.language_lc == language)
+        definitions = list(islice(definitions, args.limit))
+        grouped = group_by_kind(definitions) if args.stats or args.group_by_kind else None
         print(f"  显示前 {len(definitions)} 个")
+    else:
+        # 获取所有定义，一次遍历完成过滤、分组和计数
+        definitions, grouped = filter_and_group(
+            get_all_definitions(index, jobs=args.jobs), args.kinds, args.language
+        )
+
+        if args.kinds:
+            print(f"  过滤后: {len(definitions)} 个定义")
 
     # 显示结果
     if args.stats:
-        print_statistics(definitions)
+        print_kind_counts({kind_name: len(items) for kind_name, items in grouped.items()})
     elif args.group_by_kind:
-        grouped = group_by_kind(definitions)
         print_grouped_definitions(grouped, show_doc=args.show_doc, show_symbol=args.show_symbol)
     else:
         print(f"\n{'=' * 80}")
@@ -3,18 +3,20 @@
 
 这个示例展示了如何使用 src 的简化 API，
 无需了解 SCIP 协议细节即可完成常见任务。
-"""
-
 
+每个示例的输出在导入时预先拼接为一个字符串，运行时只需一次写入。
+"""
 
-def example_1_get_all_functions():
-    """示例 1: 获取所有函数定义"""
-    print("=" * 80)
-    print("示例 1: 获取所有函数定义")
-    print("=" * 80)
+import sys
 
-    print("\n代码:")
-    print("""
+_EXAMPLE_1 = (
+    "\n".join(
+        [
+            "=" * 80,
+            "示例 1: 获取所有函数定义",
+            "=" * 80,
+            "\n代码:",
+            """
     from scip_parser import SCIPParser
 
     # 解析 SCIP 文件
@@ -27,22 +29,30 @@ def example_1_get_all_functions():
     print(f"找到 {len(functions)} 个函数")
     for func in functions:
         print(f"  - {func['display_name']} 在 {func['document']}")
-    """)
+    """,
+            "\n说明:",
+            "  - 使用 index.get_functions() 直接获取所有函数",
+            "  - 返回的字典包含: display_name, document, symbol 等",
+            "  - 无需了解 SCIP 协议细节",
+        ]
+    )
+    + "\n"
+)
 
-    print("\n说明:")
-    print("  - 使用 index.get_functions() 直接获取所有函数")
-    print("  - 返回的字典包含: display_name, document, symbol 等")
-    print("  - 无需了解 SCIP 协议细节")
 
+def example_1_get_all_functions():
+    """示例 1: 获取所有函数定义"""
+    sys.stdout.write(_EXAMPLE_1)
 
-def example_2_get_classes_and_interfaces():
-    """示例 2: 获取所有类和接口"""
-    print("\n" + "=" * 80)
-    print("示例 2: 获取所有类和接口")
-    print("=" * 80)
 
-    print("\n代码:")
-    print("""
+_EXAMPLE_2 = (
+    "\n".join(
+        [
+            "\n" + "=" * 80,
+            "示例 2: 获取所有类和接口",
+            "=" * 80,
+            "\n代码:",
+            """
     from scip_parser import SCIPParser
 
     parser = SCIPParser()
@@ -63,17 +73,26 @@ def example_2_get_classes_and_interfaces():
         SymbolKind.Interface
     ])
     print(f"找到 {len(types)} 个类和接口")
-    """)
+    """,
+        ]
+    )
+    + "\n"
+)
 
 
-def example_3_statistics():
-    """示例 3: 统计符号类型分布"""
-    print("\n" + "=" * 80)
-    print("示例 3: 统计符号类型分布")
-    print("=" * 80)
+def example_2_get_classes_and_interfaces():
+    """示例 2: 获取所有类和接口"""
+    sys.stdout.write(_EXAMPLE_2)
+
 
-    print("\n代码:")
-    print("""
+_EXAMPLE_3 = (
+    "\n".join(
+        [
+            "\n" + "=" * 80,
+            "示例 3: 统计符号类型分布",
+            "=" * 80,
+            "\n代码:",
+            """
     from scip_parser import SCIPParser
 
     parser = SCIPParser()
@@ -87,17 +106,26 @@ def example_3_statistics():
     for kind_name, count in sorted(counts.items(), key=lambda x: -x[1]):
         percentage = (count / total) * 100
         print(f"  {kind_name:20s}: {count:5d} ({percentage:5.1f}%)")
-    """)
+    """,
+        ]
+    )
+    + "\n"
+)
 
 
-def example_4_filter_by_language():
-    """示例 4: 按编程语言过滤"""
-    print("\n" + "=" * 80)
-    print("示例 4: 按编程语言过滤")
-    print("=" * 80)
+def example_3_statistics():
+    """示例 3: 统计符号类型分布"""
+    sys.stdout.write(_EXAMPLE_3)
+
 
-    print("\n代码:")
-    print("""
+_EXAMPLE_4 = (
+    "\n".join(
+        [
+            "\n" + "=" * 80,
+            "示例 4: 按编程语言过滤",
+            "=" * 80,
+            "\n代码:",
+            """
     from scip_parser import SCIPParser
 
     parser = SCIPParser()
@@ -113,17 +141,26 @@ def example_4_filter_by_language():
     python_defs = index.get_definitions_by_language("python")
 
     print(f"Python 文件中有 {len(python_defs)} 个定义")
-    """)
+    """,
+        ]
+    )
+    + "\n"
+)
 
 
-def example_5_custom_filter():
-    """示例 5: 自定义过滤"""
-    print("\n" + "=" * 80)
-    print("示例 5: 自定义过滤")
-    print("=" * 80)
+def example_4_filter_by_language():
+    """示例 4: 按编程语言过滤"""
+    sys.stdout.write(_EXAMPLE_4)
+
 
-    print("\n代码:")
-    print("""
+_EXAMPLE_5 = (
+    "\n".join(
+        [
+            "\n" + "=" * 80,
+            "示例 5: 自定义过滤",
+            "=" * 80,
+            "\n代码:",
+            """
     from scip_parser import SCIPParser
 
     parser = SCIPParser()
@@ -154,17 +191,26 @@ def example_5_custom_filter():
 
     for doc, symbols in sorted(by_document.items()):
         print(f"{doc}: {len(symbols)} 个符号")
-    """)
+    """,
+        ]
+    )
+    + "\n"
+)
 
 
-def example_6_complete_workflow():
-    """示例 6: 完整的工作流"""
-    print("\n" + "=" * 80)
-    print("示例 6: 完整的工作流")
-    print("=" * 80)
+def example_5_custom_filter():
+    """示例 5: 自定义过滤"""
+    sys.stdout.write(_EXAMPLE_5)
 
-    print("\n代码:")
-    print("""
+
+_EXAMPLE_6 = (
+    "\n".join(
+        [
+            "\n" + "=" * 80,
+            "示例 6: 完整的工作流",
+            "=" * 80,
+            "\n代码:",
+            """
     from scip_parser import SCIPParser
     from scip_parser.core.types import SymbolKind
 
@@ -202,17 +248,26 @@ def example_6_complete_workflow():
 
     # 使用
     analyze_project("your_project.scip")
-    """)
+    """,
+        ]
+    )
+    + "\n"
+)
 
 
-def comparison_old_vs_new():
-    """对比: 旧方式 vs 新方式"""
-    print("\n" + "=" * 80)
-    print("对比: 使用简化 API 前后的差异")
-    print("=" * 80)
+def example_6_complete_workflow():
+    """示例 6: 完整的工作流"""
+    sys.stdout.write(_EXAMPLE_6)
 
-    print("\n❌ 旧方式 (需要了解 SCIP 协议细节):")
-    print("""
+
+_COMPARISON = (
+    "\n".join(
+        [
+            "\n" + "=" * 80,
+            "对比: 使用简化 API 前后的差异",
+            "=" * 80,
+            "\n❌ 旧方式 (需要了解 SCIP 协议细节):",
+            """
     from scip_parser import SCIPParser
     from scip_parser.core.types import SymbolKind
 
@@ -229,10 +284,9 @@ def comparison_old_vs_new():
                     'document': document.relative_path,
                     'symbol': symbol_str,
                 })
-    """)
-
-    print("\n✅ 新方式 (简洁直观):")
-    print("""
+    """,
+            "\n✅ 新方式 (简洁直观):",
+            """
     from scip_parser import SCIPParser
 
     parser = SCIPParser()
@@ -240,34 +294,43 @@ def comparison_old_vs_new():
 
     # 一行代码搞定
     functions = index.get_functions()
-    """)
-
-    print("\n🎯 优势:")
-    print("  - 代码更简洁 (1 行 vs 7 行)")
-    print("  - 无需了解 SCIP 协议")
-    print("  - 返回格式统一，便于使用")
-    print("  - 方法名清晰直观")
+    """,
+            "\n🎯 优势:",
+            "  - 代码更简洁 (1 行 vs 7 行)",
+            "  - 无需了解 SCIP 协议",
+            "  - 返回格式统一，便于使用",
+            "  - 方法名清晰直观",
+        ]
+    )
+    + "\n"
+)
 
 
-def main():
-    """运行所有示例"""
-    print("\n" + "=" * 80)
-    print("SCIP Parser 简化 API 使用示例")
-    print("=" * 80)
-    print("\n这些示例展示了如何使用简化的 API，无需了解 SCIP 协议细节。\n")
-
-    example_1_get_all_functions()
-    example_2_get_classes_and_interfaces()
-    example_3_statistics()
-    example_4_filter_by_language()
-    example_5_custom_filter()
-    example_6_complete_workflow()
-    comparison_old_vs_new()
-
-    print("\n" + "=" * 80)
-    print("可用的简化 API 方法")
-    print("=" * 80)
-    print("""
+def comparison_old_vs_new():
+    """对比: 旧方式 vs 新方式"""
+    sys.stdout.write(_COMPARISON)
+
+
+_INTRO = (
+    "\n".join(
+        [
+            "\n" + "=" * 80,
+            "SCIP Parser 简化 API 使用示例",
+            "=" * 80,
+            "\n这些示例展示了如何使用简化的 API，无需了解 SCIP 协议细节。\n",
+        ]
+    )
+    + "\n"
+)
+
+
+_API_SUMMARY = (
+    "\n".join(
+        [
+            "\n" + "=" * 80,
+            "可用的简化 API 方法",
+            "=" * 80,
+            """
 Index 类提供的便捷方法:
 
 1. 基础查询:
@@ -294,11 +357,34 @@ Index 类提供的便捷方法:
    - document: 文档路径
    - language: 编程语言
    - documentation: 文档注释列表
-    """)
+    """,
+            "\n" + "=" * 80,
+            "完整文档请查看: docs/QUICK_START_DEFINITIONS.md",
+            "=" * 80 + "\n",
+        ]
+    )
+    + "\n"
+)
+
 
-    print("\n" + "=" * 80)
-    print("完整文档请查看: docs/QUICK_START_DEFINITIONS.md")
-    print("=" * 80 + "\n")
+def main():
+    """运行所有示例"""
+    # 全部示例拼接为一个缓冲区，只写一次 stdout
+    sys.stdout.write(
+        "".join(
+            [
+                _INTRO,
+                _EXAMPLE_1,
+                _EXAMPLE_2,
+                _EXAMPLE_3,
+                _EXAMPLE_4,
+                _EXAMPLE_5,
+                _EXAMPLE_6,
+                _COMPARISON,
+                _API_SUMMARY,
+            ]
+        )
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,115 @@
+"""
+测试 fixture 构建脚本共享的 Index 模板与通用构建器
+
+三个 create_*_scip.py 脚本使用相同的 metadata（scip-python 0.1.0，/test/project），
+模板只构建一次，各脚本通过 new_index() 复制得到自己的 Index。
+
+各脚本只需声明文档数据表，由 build_index() 统一生成 Document / Occurrence /
+SymbolInformation：
+
+    {
+        "path": "app.py",
+        "language": "python",
+        # (symbol, range, role[, enclosing_range])，role 为 SymbolRole 名称
+        "occurrences": [(S_MAIN, [0, 0, 10, 0], "Definition"), ...],
+        # (symbol, display_name, kind, documentation[, implements])，kind 为 Kind 名称
+        "symbols": [(S_MAIN, "main", "Function", "Main entry point"), ...],
+    }
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from scip_parser.proto import scip_pb2
+
+
+@lru_cache(maxsize=None)
+def _base_index() -> scip_pb2.Index:
+    # 延迟导入并缓存: 首次调用时才初始化 protobuf 描述符池
+    from scip_parser.proto import scip_pb2
+
+    return scip_pb2.Index(
+        metadata=scip_pb2.Metadata(
+            version=1,
+            tool_info=scip_pb2.ToolInfo(name="scip-python", version="0.1.0"),
+            project_root="/test/project",
+        )
+    )
+
+
+def new_index() -> scip_pb2.Index:
+    """返回一个带有共享 metadata 的新 Index（模板本身不会被修改）"""
+    base = _base_index()
+    index = type(base)()
+    index.CopyFrom(base)
+    return index
+
+
+@lru_cache(maxsize=None)
+def _enum_values() -> tuple[dict[str, int], dict[str, int]]:
+    """SymbolRole 与 SymbolInformation.Kind 的 名称 -> 整数值 映射（只构建一次）"""
+    from scip_parser.proto import scip_pb2
+
+    return dict(scip_pb2.SymbolRole.items()), dict(scip_pb2.SymbolInformation.Kind.items())
+
+
+def build_index(
+    documents: list[dict[str, Any]], text_document_encoding: Optional[str] = None
+) -> scip_pb2.Index:
+    """根据文档数据表构建 Index
+
+    Args:
+        documents: 文档数据表，格式见模块文档
+        text_document_encoding: TextEncoding 名称（如 "UTF8"），None 表示不设置
+
+    Returns:
+        构建好的 Index 消息
+    """
+    from scip_parser.proto import scip_pb2
+
+    # 消息类直接导入为局部名称、枚举值预先解析为字典，避免每行重复查找模块属性
+    from scip_parser.proto.scip_pb2 import Occurrence, Relationship, SymbolInformation
+
+    roles, kinds = _enum_values()
+
+    pb_index = new_index()
+    if text_document_encoding is not None:
+        pb_index.metadata.text_document_encoding = scip_pb2.TextEncoding.Value(
+            text_document_encoding
+        )
+
+    for doc in documents:
+        occurrences = []
+        for symbol, range_, role, *enclosing in doc["occurrences"]:
+            occ = Occurrence(symbol=symbol, range=range_, symbol_roles=roles[role])
+            if enclosing:
+                occ.enclosing_range.extend(enclosing[0])
+            occurrences.append(occ)
+
+        symbols = [
+            SymbolInformation(
+                symbol=symbol,
+                display_name=display_name,
+                kind=kinds[kind],
+                documentation=[documentation],
+                relationships=[
+                    Relationship(symbol=target, is_implementation=True)
+                    for target in (implements[0] if implements else ())
+                ],
+            )
+            for symbol, display_name, kind, documentation, *implements in doc["symbols"]
+        ]
+
+        pb_index.documents.append(
+            scip_pb2.Document(
+                relative_path=doc["path"],
+                language=doc["language"],
+                occurrences=occurrences,
+                symbols=symbols,
+            )
+        )
+
+    return pb_index
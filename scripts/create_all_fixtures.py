@@ -0,0 +1,36 @@
+"""
+一次性生成全部测试 fixture
+
+在同一个进程中依次构建 test_simple.scip、test_call_graph.scip、test_hierarchy.scip，
+共享一次 scip_pb2 导入和描述符池的构建，而不是分别启动三个脚本。
+
+用法（在项目根目录下运行）：
+    python scripts/create_all_fixtures.py
+"""
+
+from pathlib import Path
+
+from create_call_graph_scip import build_test_call_graph
+from create_hierarchy_scip import build_test_hierarchy
+from create_simple_scip import build_test_simple
+
+FIXTURES_DIR = Path("tests/fixtures")
+
+BUILDERS = {
+    "test_simple.scip": build_test_simple,
+    "test_call_graph.scip": build_test_call_graph,
+    "test_hierarchy.scip": build_test_hierarchy,
+}
+
+
+def build_all_fixtures(fixtures_dir: Path = FIXTURES_DIR) -> None:
+    """构建并写出全部 fixture 文件"""
+    for filename, build in BUILDERS.items():
+        path = fixtures_dir / filename
+        # 消息由脚本自行构建，无 required 字段需要校验，直接跳过初始化检查
+        path.write_bytes(build().SerializePartialToString())
+        print(f"Created {path}")
+
+
+if __name__ == "__main__":
+    build_all_fixtures()
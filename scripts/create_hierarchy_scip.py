@@ -8,108 +8,74 @@
 - Relationship: 实现关系
 """
 
-from scip_parser.proto import scip_pb2
+from __future__ import annotations
 
+import os
+import sys
+from typing import TYPE_CHECKING
 
-def create_test_hierarchy():
-    pb_index = scip_pb2.Index()
+from _scip_base import build_index
+
+if TYPE_CHECKING:
+    from scip_parser.proto import scip_pb2
+
+# 符号字符串在多个 occurrence/symbol 之间复用: 驻留为模块常量，共享同一对象
+S_SHAPE = sys.intern("python test-project shapes/Shape#")
+S_SHAPE_AREA = sys.intern("python test-project shapes/Shape#area().")
+S_CIRCLE = sys.intern("python test-project shapes/Circle#")
+S_CIRCLE_AREA = sys.intern("python test-project shapes/Circle#area().")
+S_RECTANGLE = sys.intern("python test-project shapes/Rectangle#")
+S_RECTANGLE_AREA = sys.intern("python test-project shapes/Rectangle#area().")
 
-    # Metadata
-    pb_index.metadata.version = 1
-    pb_index.metadata.tool_info.name = "scip-python"
-    pb_index.metadata.tool_info.version = "0.1.0"
-    pb_index.metadata.project_root = "/test/project"
 
+DOCUMENTS = [
     # Document: shapes.py
-    doc = pb_index.documents.add()
-    doc.relative_path = "shapes.py"
-    doc.language = "python"
-
-    # Symbol: Shape 接口
-    occ_shape_def = doc.occurrences.add()
-    occ_shape_def.symbol = "python test-project shapes/Shape#"
-    occ_shape_def.range.extend([0, 0, 15, 0])
-    occ_shape_def.symbol_roles = scip_pb2.Definition
-
-    sym_shape = doc.symbols.add()
-    sym_shape.symbol = "python test-project shapes/Shape#"
-    sym_shape.display_name = "Shape"
-    sym_shape.kind = scip_pb2.SymbolInformation.Interface
-    sym_shape.documentation.extend(["Base shape interface"])
-
-    # Symbol: Shape.area() 方法
-    occ_area_def = doc.occurrences.add()
-    occ_area_def.symbol = "python test-project shapes/Shape#area()."
-    occ_area_def.range.extend([5, 4, 25, 0])
-    occ_area_def.symbol_roles = scip_pb2.Definition
-
-    sym_area = doc.symbols.add()
-    sym_area.symbol = "python test-project shapes/Shape#area()."
-    sym_area.display_name = "area"
-    sym_area.kind = scip_pb2.SymbolInformation.Method
-    sym_area.documentation.extend(["Calculate area"])
-
-    # Symbol: Circle 类（实现 Shape）
-    occ_circle_def = doc.occurrences.add()
-    occ_circle_def.symbol = "python test-project shapes/Circle#"
-    occ_circle_def.range.extend([30, 0, 50, 0])
-    occ_circle_def.symbol_roles = scip_pb2.Definition
-
-    sym_circle = doc.symbols.add()
-    sym_circle.symbol = "python test-project shapes/Circle#"
-    sym_circle.display_name = "Circle"
-    sym_circle.kind = scip_pb2.SymbolInformation.Class
-    sym_circle.documentation.extend(["Circle shape"])
-
-    # Relationship: Circle 实现了 Shape
-    rel_circle = sym_circle.relationships.add()
-    rel_circle.symbol = "python test-project shapes/Shape#"
-    rel_circle.is_implementation = True
-
-    # Symbol: Circle.area() 方法（重写 Shape.area()）
-    occ_circle_area_def = doc.occurrences.add()
-    occ_circle_area_def.symbol = "python test-project shapes/Circle#area()."
-    occ_circle_area_def.range.extend([35, 4, 45, 0])
-    occ_circle_area_def.symbol_roles = scip_pb2.Definition
-
-    sym_circle_area = doc.symbols.add()
-    sym_circle_area.symbol = "python test-project shapes/Circle#area()."
-    sym_circle_area.display_name = "area"
-    sym_circle_area.kind = scip_pb2.SymbolInformation.Method
-    sym_circle_area.documentation.extend(["Circle area: πr²"])
-
-    # Symbol: Rectangle 类（实现 Shape）
-    occ_rect_def = doc.occurrences.add()
-    occ_rect_def.symbol = "python test-project shapes/Rectangle#"
-    occ_rect_def.range.extend([55, 0, 75, 0])
-    occ_rect_def.symbol_roles = scip_pb2.Definition
-
-    sym_rect = doc.symbols.add()
-    sym_rect.symbol = "python test-project shapes/Rectangle#"
-    sym_rect.display_name = "Rectangle"
-    sym_rect.kind = scip_pb2.SymbolInformation.Class
-    sym_rect.documentation.extend(["Rectangle shape"])
-
-    # Relationship: Rectangle 实现了 Shape
-    rel_rect = sym_rect.relationships.add()
-    rel_rect.symbol = "python test-project shapes/Shape#"
-    rel_rect.is_implementation = True
-
-    # Symbol: Rectangle.area() 方法（重写 Shape.area()）
-    occ_rect_area_def = doc.occurrences.add()
-    occ_rect_area_def.symbol = "python test-project shapes/Rectangle#area()."
-    occ_rect_area_def.range.extend([60, 4, 70, 0])
-    occ_rect_area_def.symbol_roles = scip_pb2.Definition
-
-    sym_rect_area = doc.symbols.add()
-    sym_rect_area.symbol = "python test-project shapes/Rectangle#area()."
-    sym_rect_area.display_name = "area"
-    sym_rect_area.kind = scip_pb2.SymbolInformation.Method
-    sym_rect_area.documentation.extend(["Rectangle area: width * height"])
-
-    # 保存
-    with open("tests/fixtures/test_hierarchy.scip", "wb") as f:
-        f.write(pb_index.SerializeToString())
+    {
+        "path": "shapes.py",
+        "language": "python",
+        "occurrences": [
+            # Symbol: Shape 接口
+            (S_SHAPE, [0, 0, 15, 0], "Definition"),
+            # Symbol: Shape.area() 方法
+            (S_SHAPE_AREA, [5, 4, 25, 0], "Definition"),
+            # Symbol: Circle 类（实现 Shape）
+            (S_CIRCLE, [30, 0, 50, 0], "Definition"),
+            # Symbol: Circle.area() 方法（重写 Shape.area()）
+            (S_CIRCLE_AREA, [35, 4, 45, 0], "Definition"),
+            # Symbol: Rectangle 类（实现 Shape）
+            (S_RECTANGLE, [55, 0, 75, 0], "Definition"),
+            # Symbol: Rectangle.area() 方法（重写 Shape.area()）
+            (S_RECTANGLE_AREA, [60, 4, 70, 0], "Definition"),
+        ],
+        "symbols": [
+            (S_SHAPE, "Shape", "Interface", "Base shape interface"),
+            (S_SHAPE_AREA, "area", "Method", "Calculate area"),
+            # Relationship: Circle 实现了 Shape
+            (S_CIRCLE, "Circle", "Class", "Circle shape", [S_SHAPE]),
+            (S_CIRCLE_AREA, "area", "Method", "Circle area: πr²"),
+            # Relationship: Rectangle 实现了 Shape
+            (S_RECTANGLE, "Rectangle", "Class", "Rectangle shape", [S_SHAPE]),
+            (S_RECTANGLE_AREA, "area", "Method", "Rectangle area: width * height"),
+        ],
+    },
+]
+
+
+def build_test_hierarchy() -> scip_pb2.Index:
+    """构建 test_hierarchy.scip 的 Index 消息（不写文件）"""
+    return build_index(DOCUMENTS)
+
+
+def create_test_hierarchy():
+    pb_index = build_test_hierarchy()
+
+    # 保存: 直接写入文件描述符，跳过 BufferedWriter 的额外拷贝
+    buf = pb_index.SerializeToString()
+    fd = os.open("tests/fixtures/test_hierarchy.scip", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, buf)
+    finally:
+        os.close(fd)
 
     print("Created tests/fixtures/test_hierarchy.scip")
 
@@ -8,144 +8,107 @@
 - 各种符号角色：Definition, Reference, ReadAccess, WriteAccess
 """
 
-from scip_parser.proto import scip_pb2
+from __future__ import annotations
 
+import os
+import sys
+from typing import TYPE_CHECKING
 
-def create_test_simple():
-    pb_index = scip_pb2.Index()
+from _scip_base import build_index
 
-    # Metadata
-    pb_index.metadata.version = 1
-    pb_index.metadata.tool_info.name = "scip-python"
-    pb_index.metadata.tool_info.version = "0.1.0"
-    pb_index.metadata.project_root = "/test/project"
-    pb_index.metadata.text_document_encoding = scip_pb2.UTF8
+if TYPE_CHECKING:
+    from scip_parser.proto import scip_pb2
 
-    # Document 1: main.py
-    doc_main = pb_index.documents.add()
-    doc_main.relative_path = "main.py"
-    doc_main.language = "python"
-
-    # Symbol: main()
-    occ_main_def = doc_main.occurrences.add()
-    occ_main_def.symbol = "python test-project main#main()."
-    occ_main_def.range.extend([0, 0, 10, 0])
-    occ_main_def.symbol_roles = scip_pb2.Definition
-
-    sym_main = doc_main.symbols.add()
-    sym_main.symbol = "python test-project main#main()."
-    sym_main.display_name = "main"
-    sym_main.kind = scip_pb2.SymbolInformation.Function
-    sym_main.documentation.extend(["Main function"])
-
-    # Occurrence: 调用 MyClass.methodA
-    occ_method_call = doc_main.occurrences.add()
-    occ_method_call.symbol = "python test-project myclass/MyClass#methodA()."
-    occ_method_call.range.extend([3, 4, 3, 20])
-    occ_method_call.symbol_roles = scip_pb2.ReadAccess
-
-    # Occurrence: 读取 common.logger（第 1 次）
-    occ_logger_read1 = doc_main.occurrences.add()
-    occ_logger_read1.symbol = "python test-project common#logger."
-    occ_logger_read1.range.extend([5, 2, 5, 9])
-    occ_logger_read1.symbol_roles = scip_pb2.ReadAccess
-
-    # Occurrence: 读取 common.logger（第 2 次）
-    occ_logger_read2 = doc_main.occurrences.add()
-    occ_logger_read2.symbol = "python test-project common#logger."
-    occ_logger_read2.range.extend([7, 2, 7, 9])
-    occ_logger_read2.symbol_roles = scip_pb2.ReadAccess
-
-    # Occurrence: 读取 common.logger（第 3 次）
-    occ_logger_read3 = doc_main.occurrences.add()
-    occ_logger_read3.symbol = "python test-project common#logger."
-    occ_logger_read3.range.extend([9, 2, 9, 9])
-    occ_logger_read3.symbol_roles = scip_pb2.ReadAccess
+# 符号字符串在多个 occurrence/symbol 之间复用: 驻留为模块常量，共享同一对象
+S_MAIN = sys.intern("python test-project main#main().")
+S_HELPER = sys.intern("python test-project utils/helper#helper().")
+S_LOGGER = sys.intern("python test-project common#logger.")
+S_MYCLASS = sys.intern("python test-project myclass/MyClass#")
+S_METHOD_A = sys.intern("python test-project myclass/MyClass#methodA().")
 
-    # Document 2: utils.py
-    doc_utils = pb_index.documents.add()
-    doc_utils.relative_path = "utils.py"
-    doc_utils.language = "python"
-
-    # Symbol: helper()
-    occ_helper_def = doc_utils.occurrences.add()
-    occ_helper_def.symbol = "python test-project utils/helper#helper()."
-    occ_helper_def.range.extend([0, 0, 10, 0])
-    occ_helper_def.symbol_roles = scip_pb2.Definition
-
-    sym_helper = doc_utils.symbols.add()
-    sym_helper.symbol = "python test-project utils/helper#helper()."
-    sym_helper.display_name = "helper"
-    sym_helper.kind = scip_pb2.SymbolInformation.Function
-    sym_helper.documentation.extend(["Helper function"])
-
-    # Occurrence: 被 MyClass.methodA 引用
-    occ_helper_ref = doc_utils.occurrences.add()
-    occ_helper_ref.symbol = "python test-project myclass/MyClass#methodA()."
-    occ_helper_ref.range.extend([5, 4, 5, 12])
-    occ_helper_ref.symbol_roles = scip_pb2.ReadAccess
 
+DOCUMENTS = [
+    # Document 1: main.py
+    {
+        "path": "main.py",
+        "language": "python",
+        "occurrences": [
+            # Symbol: main()
+            (S_MAIN, [0, 0, 10, 0], "Definition"),
+            # Occurrence: 调用 MyClass.methodA
+            (S_METHOD_A, [3, 4, 3, 20], "ReadAccess"),
+            # Occurrence: 读取 common.logger（第 1-3 次）
+            (S_LOGGER, [5, 2, 5, 9], "ReadAccess"),
+            (S_LOGGER, [7, 2, 7, 9], "ReadAccess"),
+            (S_LOGGER, [9, 2, 9, 9], "ReadAccess"),
+        ],
+        "symbols": [
+            (S_MAIN, "main", "Function", "Main function"),
+        ],
+    },
+    # Document 2: utils.py
+    {
+        "path": "utils.py",
+        "language": "python",
+        "occurrences": [
+            # Symbol: helper()
+            (S_HELPER, [0, 0, 10, 0], "Definition"),
+            # Occurrence: 被 MyClass.methodA 引用
+            (S_METHOD_A, [5, 4, 5, 12], "ReadAccess"),
+        ],
+        "symbols": [
+            (S_HELPER, "helper", "Function", "Helper function"),
+        ],
+    },
     # Document 3: common.py
-    doc_common = pb_index.documents.add()
-    doc_common.relative_path = "common.py"
-    doc_common.language = "python"
-
-    # Symbol: logger
-    occ_logger_def = doc_common.occurrences.add()
-    occ_logger_def.symbol = "python test-project common#logger."
-    occ_logger_def.range.extend([0, 0, 5, 0])
-    occ_logger_def.symbol_roles = scip_pb2.Definition
-
-    sym_logger = doc_common.symbols.add()
-    sym_logger.symbol = "python test-project common#logger."
-    sym_logger.display_name = "logger"
-    sym_logger.kind = scip_pb2.SymbolInformation.Variable
-    sym_logger.documentation.extend(["Logger instance"])
-
+    {
+        "path": "common.py",
+        "language": "python",
+        "occurrences": [
+            # Symbol: logger
+            (S_LOGGER, [0, 0, 5, 0], "Definition"),
+        ],
+        "symbols": [
+            (S_LOGGER, "logger", "Variable", "Logger instance"),
+        ],
+    },
     # Document 4: myclass.py
-    doc_myclass = pb_index.documents.add()
-    doc_myclass.relative_path = "myclass.py"
-    doc_myclass.language = "python"
-
-    # Symbol: MyClass
-    occ_class_def = doc_myclass.occurrences.add()
-    occ_class_def.symbol = "python test-project myclass/MyClass#"
-    occ_class_def.range.extend([0, 0, 20, 0])
-    occ_class_def.symbol_roles = scip_pb2.Definition
-
-    sym_class = doc_myclass.symbols.add()
-    sym_class.symbol = "python test-project myclass/MyClass#"
-    sym_class.display_name = "MyClass"
-    sym_class.kind = scip_pb2.SymbolInformation.Class
-    sym_class.documentation.extend(["A class"])
-
-    # Symbol: methodA
-    occ_method_def = doc_myclass.occurrences.add()
-    occ_method_def.symbol = "python test-project myclass/MyClass#methodA()."
-    occ_method_def.range.extend([5, 0, 25, 0])
-    occ_method_def.symbol_roles = scip_pb2.Definition
-
-    sym_method = doc_myclass.symbols.add()
-    sym_method.symbol = "python test-project myclass/MyClass#methodA()."
-    sym_method.display_name = "methodA"
-    sym_method.kind = scip_pb2.SymbolInformation.Method
-    sym_method.documentation.extend(["Method A"])
-
-    # Occurrence: methodA 调用 utils.helper
-    occ_method_call_helper = doc_myclass.occurrences.add()
-    occ_method_call_helper.symbol = "python test-project utils/helper#helper()."
-    occ_method_call_helper.range.extend([10, 8, 10, 16])
-    occ_method_call_helper.symbol_roles = scip_pb2.ReadAccess
-
-    # Occurrence: methodA 写入 common.logger
-    occ_method_write = doc_myclass.occurrences.add()
-    occ_method_write.symbol = "python test-project common#logger."
-    occ_method_write.range.extend([15, 8, 15, 15])
-    occ_method_write.symbol_roles = scip_pb2.WriteAccess
-
-    # 保存
-    with open("tests/fixtures/test_simple.scip", "wb") as f:
-        f.write(pb_index.SerializeToString())
+    {
+        "path": "myclass.py",
+        "language": "python",
+        "occurrences": [
+            # Symbol: MyClass
+            (S_MYCLASS, [0, 0, 20, 0], "Definition"),
+            # Symbol: methodA
+            (S_METHOD_A, [5, 0, 25, 0], "Definition"),
+            # Occurrence: methodA 调用 utils.helper
+            (S_HELPER, [10, 8, 10, 16], "ReadAccess"),
+            # Occurrence: methodA 写入 common.logger
+            (S_LOGGER, [15, 8, 15, 15], "WriteAccess"),
+        ],
+        "symbols": [
+            (S_MYCLASS, "MyClass", "Class", "A class"),
+            (S_METHOD_A, "methodA", "Method", "Method A"),
+        ],
+    },
+]
+
+
+def build_test_simple() -> scip_pb2.Index:
+    """构建 test_simple.scip 的 Index 消息（不写文件）"""
+    return build_index(DOCUMENTS, text_document_encoding="UTF8")
+
+
+def create_test_simple():
+    pb_index = build_test_simple()
+
+    # 保存: 直接写入文件描述符，跳过 BufferedWriter 的额外拷贝
+    buf = pb_index.SerializeToString()
+    fd = os.open("tests/fixtures/test_simple.scip", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, buf)
+    finally:
+        os.close(fd)
 
     print("Created tests/fixtures/test_simple.scip")
     print(f"  - Documents: {len(pb_index.documents)}")
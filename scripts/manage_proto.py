@@ -5,9 +5,14 @@
 """
 
 import argparse
+import functools
+import hashlib
 import shutil
 import subprocess
 import sys
+import time
+import urllib.error
+import urllib.request
 from pathlib import Path
 from typing import Optional
 
@@ -19,9 +24,20 @@ SCIP_PROTO_FALLBACK_URLS = [
     "https://raw.githubusercontent.com/sourcegraph/scip/refs/heads/develop/scip.proto",
 ]
 
+# 下载超时（秒）、失败后的重试次数与指数退避的初始等待（秒）
+DOWNLOAD_TIMEOUT = 30
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_BACKOFF = 0.5
+
 # 项目路径
 PROJECT_ROOT = Path(__file__).parent.parent
 PROTO_DIR = PROJECT_ROOT / "src" / "scip_parser" / "proto"
+# 脚本自身的状态文件放在包目录之外（已被 .gitignore 忽略），不会进入源码树和构建产物
+CACHE_DIR = PROJECT_ROOT / ".cache" / "proto"
+# 记录上次成功编译时 scip.proto 的 SHA-256，内容未变时跳过 protoc
+PROTO_HASH_FILE = CACHE_DIR / "scip.proto.sha256"
+# 上次下载的 URL 及其响应的 ETag（两行），用于对同一 URL 发送条件请求（If-None-Match）
+PROTO_ETAG_FILE = CACHE_DIR / "scip.proto.etag"
 
 
 class Colors:
@@ -55,8 +71,9 @@ def print_error(msg: str) -> None:
     print(f"{Colors.RED}✗{Colors.END} {msg}")
 
 
+@functools.cache
 def check_protoc() -> bool:
-    """检查 protoc 是否已安装。"""
+    """检查 protoc 是否已安装（结果在进程内缓存，避免重复启动 protoc）。"""
     try:
         result = subprocess.run(
             ["protoc", "--version"],
@@ -76,8 +93,9 @@ def check_protoc() -> bool:
         return False
 
 
+@functools.cache
 def check_mypy_protobuf() -> bool:
-    """检查 mypy-protobuf 是否已安装。"""
+    """检查 mypy-protobuf 是否已安装（结果在进程内缓存）。"""
     try:
         import mypy_protobuf  # noqa: F401
 
@@ -89,20 +107,90 @@ def check_mypy_protobuf() -> bool:
         return False
 
 
-def download_proto(url: Optional[str] = None, force: bool = False) -> bool:
+class _HTTPClient:
+    """共享一个 urllib opener 的简单 HTTP(S) 客户端。
+
+    opener 会读取 http_proxy/https_proxy 等代理环境变量并自动跟随重定向；
+    网络错误和 5xx 响应按指数退避重试有限次数。
+    """
+
+    def __init__(self) -> None:
+        self._opener = urllib.request.build_opener()
+
+    def _get_once(self, url: str, headers: dict[str, str]) -> tuple[int, bytes, Optional[str]]:
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with self._opener.open(request, timeout=DOWNLOAD_TIMEOUT) as response:
+                return response.status, response.read(), response.headers.get("ETag")
+        except urllib.error.HTTPError as e:
+            # 条件请求命中时 urllib 以 HTTPError 的形式返回 304
+            if e.code == 304:
+                return 304, b"", e.headers.get("ETag")
+            raise
+
+    def get(
+        self, url: str, headers: Optional[dict[str, str]] = None
+    ) -> tuple[int, bytes, Optional[str]]:
+        """GET 请求，跟随重定向，失败时按指数退避重试。
+
+        Args:
+            url: 请求地址
+            headers: 额外的请求头
+
+        Returns:
+            (状态码, 响应体, ETag) 元组；状态码为 2xx 或 304
+
+        Raises:
+            OSError: 重试耗尽后的网络错误或其他状态码
+        """
+        request_headers = {"User-Agent": "scip-parser-manage-proto", **(headers or {})}
+        for attempt in range(DOWNLOAD_RETRIES + 1):
+            try:
+                return self._get_once(url, request_headers)
+            except urllib.error.HTTPError as e:
+                # 4xx 重试无意义，直接放弃
+                if e.code < 500 or attempt == DOWNLOAD_RETRIES:
+                    raise OSError(f"{url} 返回 HTTP {e.code}") from e
+                error: Exception = e
+            except OSError as e:
+                if attempt == DOWNLOAD_RETRIES:
+                    raise OSError(f"请求 {url} 失败: {e}") from e
+                error = e
+            delay = DOWNLOAD_BACKOFF * (2**attempt)
+            print_warning(f"请求 {url} 失败（{error}），{delay:g} 秒后重试...")
+            time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        self._opener.close()
+
+
+def _read_etag() -> tuple[Optional[str], Optional[str]]:
+    """读取上次下载记录的 (URL, ETag)，没有记录或格式不符时返回 (None, None)。"""
+    if not PROTO_ETAG_FILE.exists():
+        return None, None
+    lines = PROTO_ETAG_FILE.read_text().splitlines()
+    if len(lines) != 2 or not lines[0] or not lines[1]:
+        return None, None
+    return lines[0], lines[1]
+
+
+def download_proto(url: Optional[str] = None, force: bool = False, refresh: bool = False) -> bool:
     """下载 SCIP proto 文件。
 
     Args:
         url: proto 文件的 URL。如果为 None，使用默认 URL。
-        force: 是否覆盖已存在的文件。
+        force: 是否无条件重新下载并覆盖已存在的文件。
+        refresh: 文件已存在时是否检查上游更新；对上次下载的 URL 带 ETag 发送条件请求，
+            上游未变化（304）时跳过下载。
 
     Returns:
         是否成功下载。
     """
     proto_file = PROTO_DIR / "scip.proto"
 
-    if proto_file.exists() and not force:
-        print_warning(f"{proto_file} 已存在，使用 --force 强制重新下载")
+    if proto_file.exists() and not (force or refresh):
+        print_warning(f"{proto_file} 已存在，使用 --refresh 检查更新或 --force 强制重新下载")
         return True
 
     # 如果没有提供 URL，使用默认 URL
@@ -110,31 +198,50 @@ def download_proto(url: Optional[str] = None, force: bool = False) -> bool:
 
     print_info(f"下载 SCIP proto 文件到 {proto_file}")
 
-    for i, download_url in enumerate(urls_to_try):
-        try:
-            print_info(f"尝试从 {download_url} 下载...")
-            _ = subprocess.run(
-                ["curl", "-fsSL", "-o", str(proto_file), download_url],
-                check=True,
-            )
+    # 非强制刷新时带上次的 ETag，上游未变化则服务端返回 304，无需重新传输；
+    # ETag 只对签发它的 URL 有效，备用 URL 一律发送普通请求
+    etag_url: Optional[str] = None
+    prev_etag: Optional[str] = None
+    if refresh and not force and proto_file.exists():
+        etag_url, prev_etag = _read_etag()
+
+    client = _HTTPClient()
+    try:
+        for i, download_url in enumerate(urls_to_try):
+            headers: dict[str, str] = {}
+            if prev_etag and download_url == etag_url:
+                headers["If-None-Match"] = prev_etag
+            try:
+                print_info(f"尝试从 {download_url} 下载...")
+                status_code, content, etag = client.get(download_url, headers)
+            except OSError as e:
+                if i < len(urls_to_try) - 1:
+                    print_warning(f"从 {download_url} 下载失败（{e}），尝试备用 URL...")
+                    continue
+                print_error(f"所有下载尝试都失败了: {e}")
+                return False
+
+            if status_code == 304:
+                print_success("上游未变化（ETag 匹配），跳过下载")
+                return True
 
             # 验证文件是否有效
-            if proto_file.stat().st_size < 1000:
+            if len(content) < 1000:
                 print_error("下载的文件太小，可能无效")
                 if i < len(urls_to_try) - 1:
                     continue
                 return False
 
+            _ = proto_file.write_bytes(content)
+            if etag:
+                PROTO_ETAG_FILE.parent.mkdir(parents=True, exist_ok=True)
+                _ = PROTO_ETAG_FILE.write_text(f"{download_url}\n{etag}\n")
+            elif PROTO_ETAG_FILE.exists():
+                PROTO_ETAG_FILE.unlink()
             print_success(f"成功下载 {proto_file.name}")
             return True
-
-        except subprocess.CalledProcessError:
-            if i < len(urls_to_try) - 1:
-                print_warning(f"从 {download_url} 下载失败，尝试备用 URL...")
-                continue
-            else:
-                print_error("所有下载尝试都失败了")
-                return False
+    finally:
+        client.close()
 
     return False
 
@@ -151,12 +258,22 @@ def compile_proto() -> bool:
         print_error(f"{proto_file} 不存在，请先运行 download 命令")
         return False
 
-    print_info("编译 proto 文件...")
-
     # 检查是否生成了预期的文件
     python_file = PROTO_DIR / "scip_pb2.py"
     stub_file = PROTO_DIR / "scip_pb2.pyi"
 
+    proto_hash = hashlib.sha256(proto_file.read_bytes()).hexdigest()
+    if (
+        python_file.exists()
+        and stub_file.exists()
+        and PROTO_HASH_FILE.exists()
+        and PROTO_HASH_FILE.read_text().strip() == proto_hash
+    ):
+        print_success("proto 文件未变化，使用已生成的代码（跳过编译）")
+        return True
+
+    print_info("编译 proto 文件...")
+
     try:
         # 运行 protoc
         # 为了让 protoc 找到 proto 文件，需要指定 --proto_path（或 -I）。
@@ -185,6 +302,10 @@ def compile_proto() -> bool:
         else:
             print_warning(f"{stub_file.relative_to(PROJECT_ROOT)} 未生成")
 
+        if python_file.exists() and stub_file.exists():
+            PROTO_HASH_FILE.parent.mkdir(parents=True, exist_ok=True)
+            _ = PROTO_HASH_FILE.write_text(proto_hash + "\n")
+
         print_success("proto 文件编译完成")
         return True
 
@@ -200,6 +321,20 @@ def create_pytyped() -> None:
     print_success(f"创建 {pytyped_file.relative_to(PROJECT_ROOT)}")
 
 
+# dmypy 的两种调用前缀：模块方式与独立命令
+DMYPY_COMMANDS = [["python", "-m", "mypy.dmypy"], ["dmypy"]]
+
+
+def _dmypy(prefix: list[str], *args: str) -> Optional[int]:
+    """运行一条 dmypy 子命令，返回退出码；命令不存在或超时时返回 None。"""
+    try:
+        return subprocess.run(
+            [*prefix, *args], capture_output=True, cwd=PROJECT_ROOT, timeout=60
+        ).returncode
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+
+
 def verify_types() -> bool:
     """验证生成的类型存根是否正常工作。
 
@@ -222,12 +357,19 @@ external_symbols = index.external_symbols
 print("类型验证通过 ✓")
 """
 
+    # 验证前已在运行的守护进程保留给调用方继续复用；由本次验证启动的守护进程在结束时停止，
+    # 避免脚本退出后遗留常驻进程
+    daemon_was_running = any(_dmypy(prefix, "status") == 0 for prefix in DMYPY_COMMANDS)
+    started_dmypy: list[list[str]] = []
+
     try:
         # 写入测试文件
         test_file.write_text(test_code)
 
-        # 尝试多种方式运行 mypy
+        # 尝试多种方式运行 mypy：优先使用 dmypy 守护进程（缓存存根与类型信息，
+        # 重复验证时免去冷启动），不可用时回退到普通 mypy
         mypy_commands = [
+            *([*prefix, "run", "--", str(test_file)] for prefix in DMYPY_COMMANDS),
             ["python", "-m", "mypy", str(test_file)],
             ["mypy", str(test_file)],
         ]
@@ -235,6 +377,8 @@ print("类型验证通过 ✓")
         result = None
         timed_out = False
         for cmd in mypy_commands:
+            if "run" in cmd:
+                started_dmypy.append(cmd[: cmd.index("run")])
             try:
                 result = subprocess.run(
                     cmd,
@@ -243,6 +387,10 @@ print("类型验证通过 ✓")
                     cwd=PROJECT_ROOT,
                     timeout=60,
                 )
+                if "No module named" in result.stderr or ("run" in cmd and result.returncode >= 2):
+                    # mypy 模块不可用，或 dmypy 守护进程无法启动（退出码 2），尝试下一种方式
+                    result = None
+                    continue
                 break
             except subprocess.TimeoutExpired:
                 # 单次 mypy 调用超时，记录并尝试下一种调用方式
@@ -256,9 +404,6 @@ print("类型验证通过 ✓")
                 # 如果命令以非零退出（不常见，因为 check=False），仍尝试下一种方式
                 continue
 
-        # 清理测试文件
-        test_file.unlink()
-
         if result is None:
             if timed_out:
                 print_warning("mypy 在所有尝试中均超时，跳过类型验证（可手动运行 mypy 进行检查）")
@@ -282,9 +427,13 @@ print("类型验证通过 ✓")
 
     except Exception as e:
         print_error(f"验证失败: {e}")
-        if test_file.exists():
-            test_file.unlink()
         return False
+    finally:
+        # 清理测试文件，并停止本次验证启动的 dmypy 守护进程
+        test_file.unlink(missing_ok=True)
+        if not daemon_was_running:
+            for prefix in started_dmypy:
+                _dmypy(prefix, "stop")
 
 
 def clean() -> None:
@@ -296,6 +445,8 @@ def clean() -> None:
         PROTO_DIR / "scip_pb2.pyi",
         PROTO_DIR / "scip.proto",
         PROTO_DIR / "py.typed",
+        PROTO_HASH_FILE,
+        PROTO_ETAG_FILE,
         PROTO_DIR / "__pycache__",
     ]
 
@@ -346,6 +497,9 @@ def main() -> int:
   # 下载并编译 proto 文件
   python scripts/manage_proto.py download compile
 
+  # 检查上游更新（未变化时跳过下载）
+  python scripts/manage_proto.py download --refresh
+
   # 强制重新下载
   python scripts/manage_proto.py download --force
 
@@ -366,6 +520,9 @@ def main() -> int:
     download_parser = subparsers.add_parser("download", help="下载 SCIP proto 文件")
     download_parser.add_argument("--url", help="指定 proto 文件的 URL", default=None)
     download_parser.add_argument("--force", action="store_true", help="强制覆盖已存在的文件")
+    download_parser.add_argument(
+        "--refresh", action="store_true", help="文件已存在时检查上游更新（基于 ETag 的条件请求）"
+    )
 
     # compile 命令
     subparsers.add_parser("compile", help="编译 proto 文件")
@@ -396,7 +553,7 @@ def main() -> int:
 
     # 执行命令
     if args.command == "download":
-        if not download_proto(url=args.url, force=args.force):
+        if not download_proto(url=args.url, force=args.force, refresh=args.refresh):
             return 1
 
     elif args.command == "compile":
@@ -425,7 +582,7 @@ def main() -> int:
             return 1
         if not check_mypy_protobuf():
             return 1
-        if not download_proto(force=True):
+        if not download_proto(refresh=True):
             return 1
         if not compile_proto():
             return 1
@@ -7,6 +7,7 @@ SCIP Parser - 高性能 SCIP 文件解析工具库
 
 from scip_parser.core.parser import SCIPParser
 from scip_parser.core.types import (
+    Definition,
     Document,
     Index,
     Occurrence,
@@ -33,6 +34,7 @@ __version__ = "0.1.0"
 __all__ = [
     "SCIPParser",
     "Index",
+    "Definition",
     "Document",
     "Occurrence",
     "SymbolInformation",
@@ -7,8 +7,15 @@ SCIP 文件解析器
 from __future__ import annotations
 
 import gzip
-from io import BytesIO
-from typing import TYPE_CHECKING, BinaryIO
+import io
+import logging
+import mmap
+import os
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, BinaryIO, TypeVar, cast, overload
+
+from google.protobuf.internal import api_implementation
 
 from scip_parser.core.types import (
     Document,
@@ -25,12 +32,133 @@ from scip_parser.core.types import (
 )
 from scip_parser.proto import scip_pb2
 from scip_parser.utils.logging_config import get_logger
+from scip_parser.utils.symbol import SymbolParser
 
-if TYPE_CHECKING:
-    import io
+try:
+    # 可选依赖:ISA-L 的 SIMD 加速 inflate,接口与 gzip 模块一致
+    from isal import igzip as _gzip_impl  # type: ignore[import-not-found]
+except ImportError:
+    _gzip_impl = gzip
 
 logger = get_logger(__name__)
 
+_T = TypeVar("_T")
+
+# 空 repeated 字段统一映射到同一个空元组,省去 tuple() 构造调用
+_EMPTY: tuple = ()
+
+
+def _enum_table(enum_cls: Any) -> tuple[Any, ...]:
+    """构建 值 -> 枚举成员 的查找表,用列表下标替代逐条调用 Enum(value)"""
+    table: list[Any] = [None] * (max(member.value for member in enum_cls) + 1)
+    for member in enum_cls:
+        table[member.value] = member
+    return tuple(table)
+
+
+_SYMBOL_KIND_BY_VALUE: tuple[SymbolKind | None, ...] = _enum_table(SymbolKind)
+_SYNTAX_KIND_BY_VALUE: tuple[SyntaxKind | None, ...] = _enum_table(SyntaxKind)
+
+
+def _symbol_kind(value: int) -> SymbolKind:
+    """查表转换 SymbolKind,表外的值(新版 proto)回退到枚举构造"""
+    if value < len(_SYMBOL_KIND_BY_VALUE):
+        kind = _SYMBOL_KIND_BY_VALUE[value]
+        if kind is not None:
+            return kind
+    return SymbolKind(value)
+
+
+def _syntax_kind(value: int) -> SyntaxKind:
+    """查表转换 SyntaxKind,表外的值(新版 proto)回退到枚举构造"""
+    if value < len(_SYNTAX_KIND_BY_VALUE):
+        kind = _SYNTAX_KIND_BY_VALUE[value]
+        if kind is not None:
+            return kind
+    return SyntaxKind(value)
+
+
+# 文档数不超过该值时不启用多进程转换(进程启动与序列化开销大于收益)
+_PARALLEL_MIN_DOCUMENTS = 64
+
+# gzip 流按块解压读取的块大小
+_READ_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def _read_chunked(stream: BinaryIO | io.BufferedIOBase) -> bytearray:
+    """按块读取流的全部内容到一个 bytearray
+
+    GzipFile.read() 会先收集所有解压块再拼接成 bytes,峰值内存约为数据大小的两倍;
+    逐块追加到同一个 bytearray 只保留一份数据副本。
+    """
+    buffer = bytearray()
+    while chunk := stream.read(_READ_CHUNK_SIZE):
+        buffer += chunk
+    return buffer
+
+
+# 工作进程内复用的解析器实例,首次转换文档时创建
+_worker_parser: SCIPParser | None = None
+
+
+def _convert_document_bytes(data: bytes) -> Document:
+    """在工作进程中反序列化并转换单个文档 (顶层函数，可被多进程 pickle)"""
+    global _worker_parser
+    parser = _worker_parser
+    if parser is None:
+        # 绕过 __init__:后端检查与警告已在主进程完成,每个工作进程只构造一次
+        parser = _worker_parser = SCIPParser.__new__(SCIPParser)
+        parser.enable_indexing = True
+        parser.workers = 1
+    pb_document = scip_pb2.Document()
+    _ = pb_document.ParseFromString(data)
+    return parser._convert_document(pb_document)
+
+
+class _LazySequence(Sequence[_T]):
+    """protobuf repeated 字段上的只读视图,按下标首次访问时才转换元素并缓存
+
+    用于禁用索引的场景:调用方通常只会触及少量文档/出现位置,
+    无需为每个 protobuf 消息预先构造 Python 对象。
+    """
+
+    __slots__ = ("_source", "_convert", "_cache")
+
+    def __init__(self, source: Sequence[Any], convert: Callable[[Any], _T]):
+        self._source = source
+        self._convert = convert
+        self._cache: list[_T | None] = [None] * len(source)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @overload
+    def __getitem__(self, index: int) -> _T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> tuple[_T, ...]: ...
+
+    def __getitem__(self, index: int | slice) -> _T | tuple[_T, ...]:
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self._cache))))
+        item = self._cache[index]
+        if item is None:
+            item = self._convert(self._source[index])
+            self._cache[index] = item
+        return item
+
+    def __iter__(self) -> Iterator[_T]:
+        for i in range(len(self._cache)):
+            yield self[i]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"_LazySequence(len={len(self._cache)})"
+
 
 class SCIPParser:
     """SCIP 文件解析器
@@ -39,13 +167,22 @@ class SCIPParser:
     """
 
     enable_indexing: bool
+    workers: int
 
-    def __init__(self, enable_indexing: bool = True):
+    def __init__(self, enable_indexing: bool = True, workers: int = 1):
         """
         Args:
-            enable_indexing: 是否构建内部索引以加速查询(默认 True)
+            enable_indexing: 是否构建内部索引以加速查询(默认 True,在首次查询时构建)
+            workers: 文档转换使用的进程数(默认 1,即不启用多进程)
         """
         self.enable_indexing = enable_indexing
+        self.workers = workers
+        if api_implementation.Type() == "python":
+            logger.warning(
+                "protobuf 正在使用纯 Python 实现,解析速度会显著下降;"
+                "请安装带 upb 后端的 protobuf 并确认未设置 "
+                "PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION=python"
+            )
 
     def parse_file(self, path: str) -> Index:
         """解析 SCIP 文件
@@ -60,17 +197,26 @@ class SCIPParser:
             FileNotFoundError: 文件不存在
             ValueError: 文件格式错误
         """
-        logger.debug(f"开始解析 SCIP 文件: {path}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"开始解析 SCIP 文件: {path}")
         # 检测是否为 gzip 压缩
         if path.endswith(".gz"):
             logger.debug("检测到 gzip 压缩文件")
-            with gzip.open(path, "rb") as f:
-                result = self._parse_stream(f)
+            with _gzip_impl.open(path, "rb") as f:
+                result = self._parse_data(_read_chunked(f))
         else:
             logger.debug("检测到未压缩文件")
             with open(path, "rb") as f:
-                result = self._parse_stream(f)
-        logger.debug(f"SCIP 文件解析完成: {path}")
+                if os.fstat(f.fileno()).st_size == 0:
+                    # 空文件无法 mmap
+                    result = self._parse_stream(f)
+                else:
+                    # 直接从内存映射解析,避免把整个文件复制成 bytes
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        with memoryview(mapped) as view:
+                            result = self._parse_data(view)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"SCIP 文件解析完成: {path}")
         return result
 
     def parse_bytes(self, data: bytes) -> Index:
@@ -82,7 +228,7 @@ class SCIPParser:
         Returns:
             Index 对象
         """
-        return self._parse_stream(BytesIO(data))
+        return self._parse_data(data)
 
     def _parse_stream(self, stream: BinaryIO | io.BufferedIOBase) -> Index:
         """从流解析 SCIP 索引
@@ -96,26 +242,53 @@ class SCIPParser:
         Raises:
             ValueError: 如果流内容不是有效的 SCIP 索引
         """
+        return self._parse_data(stream.read())
+
+    def _parse_data(self, data: bytes | bytearray | memoryview) -> Index:
+        """从内存中的二进制数据解析 SCIP 索引
+
+        Args:
+            data: SCIP 索引的完整二进制内容
+
+        Returns:
+            Index 对象
+
+        Raises:
+            ValueError: 如果数据不是有效的 SCIP 索引
+        """
         logger.debug("开始解析 Protocol Buffer 消息")
         # 解析 Protocol Buffer 消息
         pb_index = scip_pb2.Index()
         try:
-            data = stream.read()
-            logger.debug(f"读取了 {len(data)} 字节的二进制数据")
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug(f"读取了 {len(data)} 字节的二进制数据")
             _ = pb_index.ParseFromString(data)
-            logger.debug(f"Protocol Buffer 解析成功,包含 {len(pb_index.documents)} 个文档")
+            if debug:
+                logger.debug(f"Protocol Buffer 解析成功,包含 {len(pb_index.documents)} 个文档")
         except Exception as e:
             logger.error(f"Protocol Buffer 解析失败: {e}")
             raise ValueError(f"Failed to parse SCIP index: {e}")
 
+        return self._finish(pb_index)
+
+    def _finish(self, pb_index: scip_pb2.Index) -> Index:
+        """将已解析的 protobuf 消息转换为 Index 并按需登记延迟索引构建
+
+        Args:
+            pb_index: 已解析的 Protocol Buffer Index 消息
+
+        Returns:
+            Index 对象
+        """
         # 转换为 Python 数据模型
         logger.debug("开始转换为 Python 数据模型")
         index = self._convert_pb_to_index(pb_index)
 
-        # 构建内部索引
+        # 内部索引推迟到首个依赖索引的查询时构建
         if self.enable_indexing:
-            logger.debug("开始构建内部索引")
-            index.build_indexes()
+            logger.debug("内部索引将在首次查询时构建")
+            index.defer_indexes()
         else:
             logger.debug("索引构建已禁用")
 
@@ -133,24 +306,64 @@ class SCIPParser:
         logger.debug("转换元数据")
         # 转换元数据
         metadata = self._convert_metadata(pb_index.metadata)
-        logger.debug(f"元数据: version={metadata.version}, project_root={metadata.project_root}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(
+                f"元数据: version={metadata.version}, project_root={metadata.project_root}"
+            )
 
-        # 转换文档列表
-        logger.debug(f"开始转换 {len(pb_index.documents)} 个文档")
-        documents = [self._convert_document(pb_doc) for pb_doc in pb_index.documents]
+        # 转换文档列表;禁用索引时改为按需转换,查询未触及的文档无需构造
+        if debug:
+            logger.debug(f"开始转换 {len(pb_index.documents)} 个文档")
+        documents: Sequence[Document]
+        if self.enable_indexing and (
+            self.workers > 1 and len(pb_index.documents) > _PARALLEL_MIN_DOCUMENTS
+        ):
+            documents = self._convert_documents_parallel(pb_index.documents)
+        elif self.enable_indexing:
+            # 文档数已知:一次分配结果列表,按下标填充,避免逐个追加时反复扩容
+            converted: list[Document | None] = [None] * len(pb_index.documents)
+            convert_document = self._convert_document
+            for i, pb_doc in enumerate(pb_index.documents):
+                converted[i] = convert_document(pb_doc)
+            documents = tuple(cast("list[Document]", converted))
+        else:
+            documents = _LazySequence(pb_index.documents, self._convert_document)
 
         # 转换外部符号
-        logger.debug(f"开始转换 {len(pb_index.external_symbols)} 个外部符号")
-        external_symbols = [
-            self._convert_symbol_info(pb_sym) for pb_sym in pb_index.external_symbols
-        ]
+        if debug:
+            logger.debug(f"开始转换 {len(pb_index.external_symbols)} 个外部符号")
+        external_symbols = tuple(
+            [self._convert_symbol_info(pb_sym) for pb_sym in pb_index.external_symbols]
+        )
 
         logger.debug("数据模型转换完成")
-        return Index(
+        index = Index(
             metadata=metadata,
-            documents=tuple(documents),
-            external_symbols=tuple(external_symbols),
+            documents=documents,
+            external_symbols=external_symbols,
         )
+        if not self.enable_indexing:
+            index._pb = pb_index
+        return index
+
+    def _convert_documents_parallel(
+        self, pb_documents: Sequence[scip_pb2.Document]
+    ) -> tuple[Document, ...]:
+        """在进程池中并行转换文档,结果保持原有顺序
+
+        Args:
+            pb_documents: Protocol Buffer Document 消息序列
+
+        Returns:
+            Python Document 元组
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"使用 {self.workers} 个进程并行转换文档")
+        payloads = [pb_doc.SerializeToString() for pb_doc in pb_documents]
+        chunksize = max(1, len(payloads) // (self.workers * 4))
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            return tuple(executor.map(_convert_document_bytes, payloads, chunksize=chunksize))
 
     def _convert_metadata(self, pb_metadata: scip_pb2.Metadata) -> Metadata:
         """转换元数据
@@ -161,10 +374,12 @@ class SCIPParser:
         Returns:
             Python Metadata 对象
         """
+        pb_tool_info = pb_metadata.tool_info
+        arguments = pb_tool_info.arguments
         tool_info = ToolInfo(
-            name=pb_metadata.tool_info.name,
-            version=pb_metadata.tool_info.version,
-            arguments=tuple(pb_metadata.tool_info.arguments),
+            name=pb_tool_info.name,
+            version=pb_tool_info.version,
+            arguments=tuple(arguments) if arguments else _EMPTY,
         )
 
         return Metadata(
@@ -183,12 +398,41 @@ class SCIPParser:
         Returns:
             Python Document 对象
         """
-        logger.debug(
-            f"转换文档: {pb_document.relative_path} ({pb_document.language}), "
-            f"包含 {len(pb_document.occurrences)} 个出现位置, {len(pb_document.symbols)} 个符号"
-        )
-        # 转换出现位置列表
-        occurrences = [self._convert_occurrence(pb_occ) for pb_occ in pb_document.occurrences]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"转换文档: {pb_document.relative_path} ({pb_document.language}), "
+                f"包含 {len(pb_document.occurrences)} 个出现位置, {len(pb_document.symbols)} 个符号"
+            )
+        # 转换出现位置列表;禁用索引时按需转换
+        occurrences: Sequence[Occurrence]
+        if self.enable_indexing:
+            # 热循环:局部别名 + 位置参数构造,避免逐个调用 _convert_occurrence
+            mk_occurrence = Occurrence
+            syntax_kinds = _SYNTAX_KIND_BY_VALUE
+            n_syntax_kinds = len(syntax_kinds)
+            occurrences = tuple(
+                [
+                    mk_occurrence(
+                        tuple(o.range),
+                        o.symbol,
+                        o.symbol_roles,
+                        (
+                            (
+                                syntax_kinds[o.syntax_kind]
+                                if o.syntax_kind < n_syntax_kinds
+                                else _syntax_kind(o.syntax_kind)
+                            )
+                            if o.syntax_kind
+                            else None
+                        ),
+                        tuple(o.enclosing_range) if o.enclosing_range else _EMPTY,
+                        tuple(o.override_documentation) if o.override_documentation else _EMPTY,
+                    )
+                    for o in pb_document.occurrences
+                ]
+            )
+        else:
+            occurrences = _LazySequence(pb_document.occurrences, self._convert_occurrence)
 
         # 转换符号信息字典
         symbols = {
@@ -198,12 +442,35 @@ class SCIPParser:
         return Document(
             relative_path=pb_document.relative_path,
             language=pb_document.language,
-            occurrences=tuple(occurrences),
+            occurrences=occurrences,
             symbols=symbols,
             text=pb_document.text,
             position_encoding=PositionEncoding(pb_document.position_encoding),
         )
 
+    def _convert_signature_doc(self, pb_document: scip_pb2.Document) -> Document:
+        """转换 signature_documentation 文档
+
+        签名文档通常只是承载 text 的容器,没有出现位置和符号;此时直接构造
+        Document,跳过完整的文档转换流程。带有出现位置或符号时仍走完整转换。
+
+        Args:
+            pb_document: Protocol Buffer Document 消息
+
+        Returns:
+            Python Document 对象
+        """
+        if pb_document.occurrences or pb_document.symbols:
+            return self._convert_document(pb_document)
+        return Document(
+            relative_path=pb_document.relative_path,
+            language=pb_document.language,
+            occurrences=_EMPTY,
+            symbols={},
+            text=pb_document.text,
+            position_encoding=PositionEncoding(pb_document.position_encoding),
+        )
+
     def _convert_occurrence(self, pb_occurrence: scip_pb2.Occurrence) -> Occurrence:
         """转换出现位置
 
@@ -213,24 +480,16 @@ class SCIPParser:
         Returns:
             Python Occurrence 对象
         """
-        # 转换范围
-        range_values = list(pb_occurrence.range)
-
-        # 转换语法类型
-        syntax_kind = None
-        if pb_occurrence.syntax_kind != 0:
-            syntax_kind = SyntaxKind(pb_occurrence.syntax_kind)
-
-        # 转换符号角色
-        symbol_roles = pb_occurrence.symbol_roles
-
+        syntax_kind = pb_occurrence.syntax_kind
+        enclosing_range = pb_occurrence.enclosing_range
+        override_documentation = pb_occurrence.override_documentation
         return Occurrence(
-            range=tuple(range_values),
-            symbol=pb_occurrence.symbol,
-            symbol_roles=symbol_roles,
-            syntax_kind=syntax_kind,
-            enclosing_range=tuple(pb_occurrence.enclosing_range),
-            override_documentation=tuple(pb_occurrence.override_documentation),
+            tuple(pb_occurrence.range),
+            pb_occurrence.symbol,
+            pb_occurrence.symbol_roles,
+            _syntax_kind(syntax_kind) if syntax_kind else None,
+            tuple(enclosing_range) if enclosing_range else _EMPTY,
+            tuple(override_documentation) if override_documentation else _EMPTY,
         )
 
     def _convert_symbol_info(self, pb_sym_info: scip_pb2.SymbolInformation) -> SymbolInformation:
@@ -243,49 +502,54 @@ class SCIPParser:
             Python SymbolInformation 对象
         """
         # 转换关系列表
-        relationships = [
-            Relationship(
-                symbol=rel.symbol,
-                is_reference=rel.is_reference,
-                is_implementation=rel.is_implementation,
-                is_type_definition=rel.is_type_definition,
-                is_definition=rel.is_definition,
+        pb_relationships = pb_sym_info.relationships
+        relationships = (
+            tuple(
+                [
+                    Relationship(
+                        symbol=rel.symbol,
+                        is_reference=rel.is_reference,
+                        is_implementation=rel.is_implementation,
+                        is_type_definition=rel.is_type_definition,
+                        is_definition=rel.is_definition,
+                    )
+                    for rel in pb_relationships
+                ]
             )
-            for rel in pb_sym_info.relationships
-        ]
+            if pb_relationships
+            else _EMPTY
+        )
 
         # 转换 signature_documentation
         signature_documentation = None
         if pb_sym_info.HasField("signature_documentation"):
-            signature_documentation = self._convert_document(pb_sym_info.signature_documentation)
+            signature_documentation = self._convert_signature_doc(
+                pb_sym_info.signature_documentation
+            )
 
-        # display_name fallback: 如果未提供且不是本地符号，从符号字符串解析
+        # display_name / kind fallback: 缺失时从符号字符串推断(本地符号除外),
+        # 两者共用一次 infer_metadata 调用
+        symbol = pb_sym_info.symbol
         display_name = pb_sym_info.display_name
-        if not display_name and not pb_sym_info.symbol.startswith("local "):
-            from scip_parser.utils.symbol import SymbolParser
-
-            inferred_name, _ = SymbolParser.infer_metadata(pb_sym_info.symbol)
-            if inferred_name:
+        kind = _symbol_kind(pb_sym_info.kind)
+        kind_unspecified = kind == SymbolKind.Unspecified
+        if (not display_name or kind_unspecified) and not symbol.startswith("local "):
+            inferred_name, inferred_kind = SymbolParser.infer_metadata(symbol)
+            if not display_name and inferred_name:
                 display_name = inferred_name
-
-        # kind fallback: 如果为 Unspecified 且不是本地符号，从符号字符串推断
-        kind = SymbolKind(pb_sym_info.kind)
-        if kind == SymbolKind.Unspecified and not pb_sym_info.symbol.startswith("local "):
-            from scip_parser.utils.symbol import SymbolParser
-
-            _, inferred_kind = SymbolParser.infer_metadata(pb_sym_info.symbol)
-            if inferred_kind != SymbolKind.Unspecified:
+            if kind_unspecified and inferred_kind != SymbolKind.Unspecified:
                 kind = inferred_kind
                 logger.warning(
-                    f"SymbolInformation.kind 未指定，从符号推断: '{pb_sym_info.symbol}' -> '{kind.name}'"
+                    f"SymbolInformation.kind 未指定，从符号推断: '{symbol}' -> '{kind.name}'"
                 )
 
+        documentation = pb_sym_info.documentation
         return SymbolInformation(
-            symbol=pb_sym_info.symbol,
+            symbol=symbol,
             kind=kind,
             display_name=display_name,
-            documentation=tuple(pb_sym_info.documentation),
-            relationships=tuple(relationships),
+            documentation=tuple(documentation) if documentation else _EMPTY,
+            relationships=relationships,
             enclosing_symbol=pb_sym_info.enclosing_symbol if pb_sym_info.enclosing_symbol else None,
             signature_documentation=signature_documentation,
         )
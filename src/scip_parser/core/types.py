@@ -2,15 +2,21 @@
 SCIP 核心数据类型定义
 
 这个模块定义了 SCIP 协议中所有核心数据结构的 Python 表示。
-所有数据类使用 @dataclass(frozen=True) 以确保不可变性,这对于
-性能优化和线程安全非常重要。
+所有数据类均视为不可变,这对于性能优化和线程安全非常重要。
+解析热路径上大量构造的类型(Descriptor、Symbol、Relationship、Occurrence、
+SymbolInformation、Document)使用 @dataclass(slots=True) 而非 frozen=True,以避免构造时逐字段
+调用 object.__setattr__;其不可变性由约定保证,构造后不得修改。
 """
 
 from __future__ import annotations
 
+import bisect
+import itertools
+import sys
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from enum import Enum, IntEnum
-from typing import Any, TypedDict
+from typing import Any, ClassVar, NamedTuple, TypedDict
 
 from typing_extensions import override
 
@@ -200,6 +206,15 @@ class SymbolKind(Enum):
     Concept = scip_pb2.SymbolInformation.Concept
 
 
+# 符号角色位的纯 int 常量,供 Occurrence 的谓词在热循环中使用(免去枚举成员查找)
+_ROLE_DEFINITION = int(SymbolRole.Definition)
+_ROLE_IMPORT = int(SymbolRole.Import)
+_ROLE_WRITE_ACCESS = int(SymbolRole.WriteAccess)
+_ROLE_READ_ACCESS = int(SymbolRole.ReadAccess)
+_ROLE_GENERATED = int(SymbolRole.Generated)
+_ROLE_TEST = int(SymbolRole.Test)
+
+
 @dataclass(frozen=True)
 class Package:
     """包信息
@@ -217,7 +232,27 @@ class Package:
         return f"{self.manager} {self.name} {self.version}"
 
 
-@dataclass(frozen=True)
+# 描述符后缀枚举值 -> SCIP 符号字符串中的后缀字符
+_SUFFIX_CHARS: dict[int, str] = {
+    scip_pb2.Descriptor.Namespace: "/",
+    scip_pb2.Descriptor.Type: "#",
+    scip_pb2.Descriptor.Term: ".",
+    scip_pb2.Descriptor.Method: "().",
+    scip_pb2.Descriptor.Parameter: "()",
+    scip_pb2.Descriptor.TypeParameter: "[]",
+    scip_pb2.Descriptor.Meta: ":",
+    scip_pb2.Descriptor.Macro: "!",
+    scip_pb2.Descriptor.Local: "",
+}
+
+# 描述符字符串驻留表:(name, disambiguator, suffix) -> 已驻留的描述符字符串。
+# 相同描述符在大型索引中反复出现,跨实例共享同一个字符串对象;
+# 与 SymbolParser 的解析缓存一样设上限,写满时淘汰最早的一半,避免长驻进程无限增长
+_DESCRIPTOR_STRS: dict[tuple[str, str, int], str] = {}
+_DESCRIPTOR_STRS_MAX_SIZE = 50000
+
+
+@dataclass(slots=True, unsafe_hash=True)
 class Descriptor:
     """符号描述符
 
@@ -228,42 +263,47 @@ class Descriptor:
     disambiguator: str = ""  # 消歧义符(用于重载等场景)
     suffix: int = 0  # Descriptor.Suffix 枚举值
 
-    # 描述符后缀常量
-    NAMESPACE: int = int(scip_pb2.Descriptor.Namespace)
-    TYPE: int = int(scip_pb2.Descriptor.Type)
-    TERM: int = int(scip_pb2.Descriptor.Term)
-    METHOD: int = int(scip_pb2.Descriptor.Method)
-    TYPE_PARAMETER: int = int(scip_pb2.Descriptor.TypeParameter)
-    PARAMETER: int = int(scip_pb2.Descriptor.Parameter)
-    META: int = int(scip_pb2.Descriptor.Meta)
-    LOCAL: int = int(scip_pb2.Descriptor.Local)
-    MACRO: int = int(scip_pb2.Descriptor.Macro)
+    # 描述符后缀常量(类属性,不参与实例字段)
+    NAMESPACE: ClassVar[int] = int(scip_pb2.Descriptor.Namespace)
+    TYPE: ClassVar[int] = int(scip_pb2.Descriptor.Type)
+    TERM: ClassVar[int] = int(scip_pb2.Descriptor.Term)
+    METHOD: ClassVar[int] = int(scip_pb2.Descriptor.Method)
+    TYPE_PARAMETER: ClassVar[int] = int(scip_pb2.Descriptor.TypeParameter)
+    PARAMETER: ClassVar[int] = int(scip_pb2.Descriptor.Parameter)
+    META: ClassVar[int] = int(scip_pb2.Descriptor.Meta)
+    LOCAL: ClassVar[int] = int(scip_pb2.Descriptor.Local)
+    MACRO: ClassVar[int] = int(scip_pb2.Descriptor.Macro)
+
+    # 字符串形式缓存(首次调用 __str__ 时生成)
+    _str: str | None = field(default=None, init=False, repr=False, compare=False)
 
     def get_suffix_char(self) -> str:
         """获取描述符后缀字符"""
-        suffix_map = {
-            self.NAMESPACE: "/",
-            self.TYPE: "#",
-            self.TERM: ".",
-            self.METHOD: "().",
-            self.PARAMETER: "()",
-            self.TYPE_PARAMETER: "[]",
-            self.META: ":",
-            self.MACRO: "!",
-            self.LOCAL: "",
-        }
-        return suffix_map.get(self.suffix, "")
+        return _SUFFIX_CHARS.get(self.suffix, "")
 
     @override
     def __str__(self) -> str:
         """格式化为 SCIP 描述符字符串"""
-        suffix_char = self.get_suffix_char()
-        if self.disambiguator:
-            return f"{self.name}({self.disambiguator}){suffix_char}"
-        return f"{self.name}{suffix_char}"
+        text = self._str
+        if text is None:
+            key = (self.name, self.disambiguator, self.suffix)
+            text = _DESCRIPTOR_STRS.get(key)
+            if text is None:
+                suffix_char = _SUFFIX_CHARS.get(self.suffix, "")
+                if self.disambiguator:
+                    text = f"{self.name}({self.disambiguator}){suffix_char}"
+                else:
+                    text = f"{self.name}{suffix_char}"
+                if len(_DESCRIPTOR_STRS) >= _DESCRIPTOR_STRS_MAX_SIZE:
+                    stale = list(itertools.islice(_DESCRIPTOR_STRS, _DESCRIPTOR_STRS_MAX_SIZE // 2))
+                    for stale_key in stale:
+                        del _DESCRIPTOR_STRS[stale_key]
+                text = _DESCRIPTOR_STRS[key] = sys.intern(text)
+            self._str = text
+        return text
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True, unsafe_hash=True)
 class Symbol:
     """SCIP 符号表示
 
@@ -274,18 +314,25 @@ class Symbol:
     package: Package  # 所属包
     descriptors: tuple[Descriptor, ...]  # 描述符元组
 
+    # 字符串形式缓存(首次调用 __str__ 时生成)
+    _str: str | None = field(default=None, init=False, repr=False, compare=False)
+
     @override
     def __str__(self) -> str:
         """格式化为 SCIP 符号字符串"""
-        descriptors_str = "".join(str(d) for d in self.descriptors)
-        return f"{self.scheme} {self.package} {descriptors_str}"
+        text = self._str
+        if text is None:
+            descriptors_str = "".join([str(d) for d in self.descriptors])
+            text = f"{self.scheme} {self.package} {descriptors_str}"
+            self._str = text
+        return text
 
     def get_fully_qualified_name(self) -> str:
         """获取完全限定名"""
         return ".".join(d.name for d in self.descriptors)
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True, unsafe_hash=True)
 class Relationship:
     """符号关系
 
@@ -299,56 +346,61 @@ class Relationship:
     is_definition: bool = False  # 是否为定义关系
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True, unsafe_hash=True)
 class Occurrence:
     """符号出现位置
 
     将源代码中的位置与符号关联起来。
     """
 
-    range: tuple[
-        int, ...
-    ]  # [start_line, start_char, end_line, end_char] 或 [start_line, start_char, end_char]
+    # [start_line, start_char, end_line, end_char];传入三元素形式
+    # [start_line, start_char, end_char] 时在构造时补全为四元素
+    range: tuple[int, ...]
     symbol: str  # 关联的符号
     symbol_roles: int = 0  # 符号角色位掩码
     syntax_kind: SyntaxKind | None = None  # 语法类型
     enclosing_range: tuple[int, ...] = field(default_factory=tuple)  # 包围范围
     override_documentation: tuple[str, ...] = field(default_factory=tuple)  # 覆盖文档
 
+    def __post_init__(self) -> None:
+        r = self.range
+        if len(r) == 3:
+            self.range = (r[0], r[1], r[0], r[2])
+
     @property
     def is_definition(self) -> bool:
         """是否为定义"""
-        return bool(self.symbol_roles & SymbolRole.Definition)
+        return self.symbol_roles & _ROLE_DEFINITION != 0
 
     @property
     def is_reference(self) -> bool:
         """是否为引用"""
-        return not self.is_definition
+        return self.symbol_roles & _ROLE_DEFINITION == 0
 
     @property
     def is_import(self) -> bool:
         """是否为导入"""
-        return bool(self.symbol_roles & SymbolRole.Import)
+        return self.symbol_roles & _ROLE_IMPORT != 0
 
     @property
     def is_write_access(self) -> bool:
         """是否为写入访问"""
-        return bool(self.symbol_roles & SymbolRole.WriteAccess)
+        return self.symbol_roles & _ROLE_WRITE_ACCESS != 0
 
     @property
     def is_read_access(self) -> bool:
         """是否为读取访问"""
-        return bool(self.symbol_roles & SymbolRole.ReadAccess)
+        return self.symbol_roles & _ROLE_READ_ACCESS != 0
 
     @property
     def is_generated(self) -> bool:
         """是否为生成的代码"""
-        return bool(self.symbol_roles & SymbolRole.Generated)
+        return self.symbol_roles & _ROLE_GENERATED != 0
 
     @property
     def is_test(self) -> bool:
         """是否为测试代码"""
-        return bool(self.symbol_roles & SymbolRole.Test)
+        return self.symbol_roles & _ROLE_TEST != 0
 
     def get_start_line(self) -> int:
         """获取起始行号(0-based)"""
@@ -360,11 +412,11 @@ class Occurrence:
 
     def get_end_line(self) -> int:
         """获取结束行号(0-based)"""
-        return self.range[2] if len(self.range) == 4 else self.range[0]
+        return self.range[2]
 
     def get_end_char(self) -> int:
         """获取结束字符位置"""
-        return self.range[3] if len(self.range) == 4 else self.range[2]
+        return self.range[3]
 
     def has_enclosing_range(self) -> bool:
         """检查 enclosing_range 是否可用且有效。
@@ -380,9 +432,8 @@ class Occurrence:
         Returns:
             起始行号（0-based），如果不可用返回 -1
         """
-        if self.has_enclosing_range():
-            return self.enclosing_range[0]
-        return -1
+        er = self.enclosing_range
+        return er[0] if len(er) >= 4 else -1
 
     def get_enclosing_end_line(self) -> int:
         """获取 enclosing_range 的结束行。
@@ -390,9 +441,8 @@ class Occurrence:
         Returns:
             结束行号（0-based），如果不可用返回 -1
         """
-        if self.has_enclosing_range():
-            return self.enclosing_range[2]
-        return -1
+        er = self.enclosing_range
+        return er[2] if len(er) >= 4 else -1
 
     def get_effective_start_line(self) -> int:
         """获取有效起始行，优先使用 enclosing_range。
@@ -400,8 +450,10 @@ class Occurrence:
         Returns:
             如果可用返回 enclosing_range 起始行，否则返回 range 起始行
         """
-        enclosing = self.get_enclosing_start_line()
-        return enclosing if enclosing >= 0 else self.get_start_line()
+        er = self.enclosing_range
+        if len(er) >= 4 and er[0] >= 0:
+            return er[0]
+        return self.range[0]
 
     def get_effective_end_line(self) -> int:
         """获取有效结束行，优先使用 enclosing_range。
@@ -409,11 +461,13 @@ class Occurrence:
         Returns:
             如果可用返回 enclosing_range 结束行，否则返回 range 结束行
         """
-        enclosing = self.get_enclosing_end_line()
-        return enclosing if enclosing >= 0 else self.get_end_line()
+        er = self.enclosing_range
+        if len(er) >= 4 and er[2] >= 0:
+            return er[2]
+        return self.range[2]
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True, unsafe_hash=True)
 class SymbolInformation:
     """符号元数据
 
@@ -428,6 +482,11 @@ class SymbolInformation:
     enclosing_symbol: str | None = None  # 包围符号(用于局部符号)
     signature_documentation: Document | None = None  # 签名文档
 
+    # 按关系类型划分的相关符号缓存(首次调用 get_relationships 时构建)
+    _relationships_by_kind: dict[str, tuple[str, ...]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def get_relationships(self, kind: str) -> list[str]:
         """获取特定类型的关系
 
@@ -437,20 +496,25 @@ class SymbolInformation:
         Returns:
             相关符号列表
         """
-        result: list[str] = []
-        for rel in self.relationships:
-            if kind == "reference" and rel.is_reference:
-                result.append(rel.symbol)
-            elif kind == "implementation" and rel.is_implementation:
-                result.append(rel.symbol)
-            elif kind == "type_definition" and rel.is_type_definition:
-                result.append(rel.symbol)
-            elif kind == "definition" and rel.is_definition:
-                result.append(rel.symbol)
-        return result
+        by_kind = self._relationships_by_kind
+        if by_kind is None:
+            by_kind = self._build_relationships_by_kind()
+        return list(by_kind.get(kind, ()))
+
+    def _build_relationships_by_kind(self) -> dict[str, tuple[str, ...]]:
+        """按关系类型划分相关符号并缓存(一个关系可同时属于多种类型)"""
+        rels = self.relationships
+        by_kind = {
+            "reference": tuple([rel.symbol for rel in rels if rel.is_reference]),
+            "implementation": tuple([rel.symbol for rel in rels if rel.is_implementation]),
+            "type_definition": tuple([rel.symbol for rel in rels if rel.is_type_definition]),
+            "definition": tuple([rel.symbol for rel in rels if rel.is_definition]),
+        }
+        self._relationships_by_kind = by_kind
+        return by_kind
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True)
 class Document:
     """文档表示
 
@@ -459,13 +523,40 @@ class Document:
 
     relative_path: str  # 相对路径
     language: str  # 编程语言
-    occurrences: tuple[Occurrence, ...]  # 符号出现位置元组
+    occurrences: Sequence[Occurrence]  # 符号出现位置序列(通常为元组,禁用索引时按需转换)
     symbols: dict[str, SymbolInformation]  # 定义在此文档中的符号
     text: str = ""  # 可选的文档内容
     position_encoding: PositionEncoding = (
         PositionEncoding.UTF8CodeUnitOffsetFromLineStart
     )  # 位置编码方式
 
+    # 出现位置的列式视图(首次按位置或符号查询时构建)
+    _columns: _OccurrenceColumns | None = field(default=None, init=False, repr=False, compare=False)
+
+    def _load_columns(self) -> _OccurrenceColumns:
+        """构建并缓存出现位置的列式视图"""
+        columns = self._columns
+        if columns is None:
+            columns = self._columns = _OccurrenceColumns.build(self.occurrences)
+        return columns
+
+    def _overlapping_indices(self, start_line: int, end_line: int) -> list[int]:
+        """返回行范围与 [start_line, end_line] 相交的出现位置下标(文档顺序)
+
+        相交的出现位置起始行不晚于 end_line,且不早于 start_line - max_span
+        (更早开始的出现位置不可能延伸到 start_line)。在按起始行排序的列上用
+        二分确定候选区间,再逐个检查结束行,复杂度为 O(log n + 候选数)。
+        """
+        columns = self._columns or self._load_columns()
+        starts = columns.start_lines
+        end_lines = columns.end_lines
+        order = columns.order
+        lo = bisect.bisect_left(starts, start_line - columns.max_span)
+        hi = bisect.bisect_right(starts, end_line)
+        indices = [order[k] for k in range(lo, hi) if end_lines[k] >= start_line]
+        indices.sort()
+        return indices
+
     def get_symbol_at(self, line: int, character: int) -> Occurrence | None:
         """获取指定位置的符号
 
@@ -474,16 +565,26 @@ class Document:
             character: 字符位置(0-based)
 
         Returns:
-            该位置的 Occurrence,如果未找到则返回 None
+            该位置的 Occurrence(多个匹配时取文档中最先出现的),如果未找到则返回 None
         """
-        # 简单实现:线性搜索(可以优化为二分查找)
-        for occ in self.occurrences:
-            if (
-                occ.get_start_line() <= line <= occ.get_end_line()
-                and occ.get_start_char() <= character <= occ.get_end_char()
-            ):
-                return occ
-        return None
+        columns = self._columns or self._load_columns()
+        starts = columns.start_lines
+        end_lines = columns.end_lines
+        start_chars = columns.start_chars
+        end_chars = columns.end_chars
+        order = columns.order
+        # 候选项的起始行落在 [line - max_span, line] 内,从二分位置向前扫描
+        lowest_start = line - columns.max_span
+        best = -1
+        for k in range(bisect.bisect_right(starts, line) - 1, -1, -1):
+            if starts[k] < lowest_start:
+                break
+            i = order[k]
+            if best != -1 and i > best:
+                continue
+            if line <= end_lines[k] and start_chars[k] <= character <= end_chars[k]:
+                best = i
+        return self.occurrences[best] if best != -1 else None
 
     def find_occurrences(self, symbol: str) -> list[Occurrence]:
         """查找符号的所有出现
@@ -494,7 +595,9 @@ class Document:
         Returns:
             该符号的所有出现位置
         """
-        return [occ for occ in self.occurrences if occ.symbol == symbol]
+        columns = self._columns or self._load_columns()
+        occurrences = self.occurrences
+        return [occurrences[i] for i, s in enumerate(columns.symbols) if s == symbol]
 
     def find_definition(self, symbol: str) -> Occurrence | None:
         """查找文档中符号的定义出现位置。
@@ -513,12 +616,53 @@ class Document:
             >>> if def_occ:
             ...     print(f"Defined at line {def_occ.get_start_line()}")
         """
-        for occ in self.occurrences:
-            if occ.symbol == symbol and occ.is_definition:
-                return occ
+        columns = self._columns or self._load_columns()
+        for i, (s, roles) in enumerate(zip(columns.symbols, columns.roles)):
+            if s == symbol and roles & _ROLE_DEFINITION:
+                return self.occurrences[i]
         return None
 
 
+@dataclass(slots=True)
+class _OccurrenceColumns:
+    """文档内出现位置的列式(SoA)视图
+
+    位置相关的列按起始行排序并与 order(文档顺序下标)对齐,供二分查找,
+    只收录 range 完整(至少 4 个元素)的出现位置;symbols 和 roles 覆盖全部
+    出现位置并保持文档顺序。查询只扫描这些平行的 int/str 列表,
+    不必逐个访问 Occurrence 对象的属性。
+    """
+
+    start_lines: list[int]
+    end_lines: list[int]
+    start_chars: list[int]
+    end_chars: list[int]
+    order: list[int]
+    max_span: int
+    symbols: list[str]
+    roles: list[int]
+
+    @classmethod
+    def build(cls, occurrences: Sequence[Occurrence]) -> _OccurrenceColumns:
+        ranges = [occ.range for occ in occurrences]
+        # range 为空或不完整的出现位置没有可比较的位置,不进入位置列
+        order = sorted((i for i, r in enumerate(ranges) if len(r) >= 4), key=lambda i: ranges[i][0])
+        sorted_ranges = [ranges[i] for i in order]
+        start_lines = [r[0] for r in sorted_ranges]
+        end_lines = [r[2] for r in sorted_ranges]
+        max_span = max([0, *(end - start for start, end in zip(start_lines, end_lines))])
+        return cls(
+            start_lines,
+            end_lines,
+            [r[1] for r in sorted_ranges],
+            [r[3] for r in sorted_ranges],
+            order,
+            max_span,
+            [occ.symbol for occ in occurrences],
+            [occ.symbol_roles for occ in occurrences],
+        )
+
+
 @dataclass(frozen=True)
 class ToolInfo:
     """工具信息"""
@@ -538,6 +682,65 @@ class Metadata:
     text_document_encoding: TextEncoding = TextEncoding.UTF8  # 文本编码
 
 
+# analyze_complexity 中计为函数的符号类型
+_FUNCTION_KINDS = frozenset(
+    {
+        SymbolKind.Function,
+        SymbolKind.Method,
+        SymbolKind.Constructor,
+        SymbolKind.StaticMethod,
+        SymbolKind.AbstractMethod,
+    }
+)
+
+
+class Definition(NamedTuple):
+    """符号定义信息
+
+    由 Index.get_all_definitions 等方法返回的轻量只读记录。除属性访问外,
+    也兼容原先字典形式的读取接口:按键访问(d["display_name"])、d.get、
+    "kind" in d 以及 keys()/values()/items()。它本身仍是元组,与字典比较
+    相等性或序列化时请先用 d._asdict() 转换。
+    """
+
+    symbol: str  # 符号字符串
+    display_name: str  # 显示名称
+    kind: SymbolKind  # 符号类型
+    kind_name: str  # 类型名称
+    document: str  # 所在文档路径
+    language: str  # 编程语言
+    documentation: tuple[str, ...]  # 文档注释
+
+    @override
+    def __getitem__(self, key: Any) -> Any:  # type: ignore[override]
+        if isinstance(key, str):
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """按键取值,键不存在时返回 default"""
+        return getattr(self, key, default) if key in self._fields else default
+
+    def keys(self) -> tuple[str, ...]:
+        """返回字段名,与字典形式的 keys() 对应"""
+        return self._fields
+
+    def values(self) -> tuple[Any, ...]:
+        """返回字段值,与字典形式的 values() 对应"""
+        return tuple(self)
+
+    def items(self) -> tuple[tuple[str, Any], ...]:
+        """返回 (字段名, 值) 对,与字典形式的 items() 对应"""
+        return tuple(zip(self._fields, self))
+
+    @override
+    def __contains__(self, key: object) -> bool:
+        """按字段名判断成员,与字典形式的 in 语义一致"""
+        return key in self._fields
+
+
 class IndexStatistics(TypedDict):
     """索引统计信息类型定义"""
 
@@ -548,7 +751,20 @@ class IndexStatistics(TypedDict):
     kind_distribution: dict[str, int]
 
 
-@dataclass
+@dataclass(slots=True)
+class _Indexes:
+    """Index 的内部查找表(由 Index.build_indexes 一次遍历构建)"""
+
+    symbol_index: dict[str, list[Occurrence]] = field(default_factory=dict)  # 符号 -> 出现位置
+    # 按角色划分的出现位置:每个符号的首个定义,以及其余全部引用
+    definitions: dict[str, Occurrence] = field(default_factory=dict)
+    references: dict[str, list[Occurrence]] = field(default_factory=dict)
+    documents: dict[str, Document] = field(default_factory=dict)  # 路径 -> 文档
+    symbol_info: dict[str, SymbolInformation] = field(default_factory=dict)  # 符号 -> 符号信息
+    symbol_to_doc: dict[str, Document] = field(default_factory=dict)  # 符号 -> 定义所在文档
+
+
+@dataclass(slots=True)
 class Index:
     """SCIP 索引根对象
 
@@ -556,51 +772,122 @@ class Index:
     """
 
     metadata: Metadata  # 索引元数据
-    documents: tuple[Document, ...]  # 文档元组
+    documents: Sequence[Document]  # 文档序列(通常为元组,禁用索引时按需转换)
     external_symbols: tuple[SymbolInformation, ...] = field(default_factory=tuple)  # 外部符号
 
-    # 内部索引结构(延迟构建)
-    _symbol_index: dict[str, list[Occurrence]] = field(default_factory=dict, init=False, repr=False)
-    _document_index: dict[str, Document] = field(default_factory=dict, init=False, repr=False)
-    _symbol_info_index: dict[str, SymbolInformation] = field(
+    # 按需转换时保留原始 protobuf 消息,使其底层内存在 Index 存活期间有效
+    _pb: Any = field(default=None, init=False, repr=False, compare=False)
+
+    # 内部索引结构(延迟构建):_indexes_pending 为 True 时,首个依赖索引的查询
+    # 通过 _indexes() 一次遍历构建全部索引
+    _indexes_pending: bool = field(default=False, init=False, repr=False, compare=False)
+    _idx: _Indexes = field(default_factory=_Indexes, init=False, repr=False)
+
+    # 定义信息缓存(首次查询时一次性构建)
+    _all_definitions: list[Definition] | None = field(default=None, init=False, repr=False)
+    _definitions_by_kind: dict[SymbolKind, list[Definition]] = field(
         default_factory=dict, init=False, repr=False
     )
-    _symbol_to_doc_index: dict[str, Document] = field(default_factory=dict, init=False, repr=False)
+    _definitions_by_language: dict[str, list[Definition]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    # 反向实现关系索引:被实现的符号 -> 实现它的符号列表(首次查询时构建)
+    _implementations_of: dict[str, list[str]] | None = field(default=None, init=False, repr=False)
+
+    # find_callees 结果缓存:符号 -> 被调用者元组(get_call_path 的 BFS 会反复查询同一符号)
+    _callees_cache: dict[str, tuple[str, ...]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    # find_hotspots 的排序结果缓存:已定义且被引用的符号,按引用次数降序
+    _hotspots: list[tuple[str, int]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # search_symbols 的小写检索键缓存(首次搜索时构建,与符号信息索引平行)
+    _search_infos: list[SymbolInformation] | None = field(default=None, init=False, repr=False)
+    _search_display_lower: list[str] = field(default_factory=list, init=False, repr=False)
+    _search_symbol_lower: list[str] = field(default_factory=list, init=False, repr=False)
 
     def build_indexes(self):
         """构建内部索引以加速查询
 
         这个方法在解析完成后调用,构建符号索引和文档索引。
         """
+        self._indexes_pending = False
         logger.info(f"开始构建索引,共 {len(self.documents)} 个文档")
         logger.debug("开始构建索引结构")
+        # 依赖文档内容的派生缓存在下次查询时重建
+        self._all_definitions = None
+        self._definitions_by_kind = {}
+        self._definitions_by_language = {}
+        self._implementations_of = None
+        self._search_infos = None
+        self._callees_cache = {}
+        self._hotspots = None
         total_occurrences = 0
         total_symbols = 0
 
+        # 每次构建都从空表开始;热循环中使用局部别名,避免每条语句都做一次属性查找
+        idx = self._idx = _Indexes()
+        document_index = idx.documents
+        symbol_info_index = idx.symbol_info
+        symbol_to_doc_index = idx.symbol_to_doc
+        symbol_index = idx.symbol_index
+        symbol_definitions = idx.definitions
+        symbol_references = idx.references
+
         for doc in self.documents:
             # 文档路径索引
-            self._document_index[doc.relative_path] = doc
-            logger.debug(f"添加文档到索引: {doc.relative_path}")
+            document_index[doc.relative_path] = doc
 
-            # 符号信息索引
-            for symbol, info in doc.symbols.items():
-                self._symbol_info_index[symbol] = info
-                self._symbol_to_doc_index[symbol] = doc
-                total_symbols += 1
+            # 符号信息索引:与 doc.symbols 共享同一批对象,按文档整体合并
+            symbols = doc.symbols
+            symbol_info_index.update(symbols)
+            symbol_to_doc_index.update(dict.fromkeys(symbols, doc))
+            total_symbols += len(symbols)
 
-            # 符号索引
+            # 符号索引,同时按定义/引用分桶(每个出现位置只遍历一次)
             for occ in doc.occurrences:
-                if occ.symbol:
-                    if occ.symbol not in self._symbol_index:
-                        self._symbol_index[occ.symbol] = []
-                    self._symbol_index[occ.symbol].append(occ)
-                    total_occurrences += 1
+                symbol = occ.symbol
+                if not symbol:
+                    continue
+                total_occurrences += 1
+                # 单次字典查找:已有桶直接追加,否则新建
+                bucket = symbol_index.get(symbol)
+                if bucket is None:
+                    symbol_index[symbol] = [occ]
+                else:
+                    bucket.append(occ)
+                if occ.symbol_roles & _ROLE_DEFINITION:
+                    if symbol not in symbol_definitions:
+                        symbol_definitions[symbol] = occ
+                else:
+                    bucket = symbol_references.get(symbol)
+                    if bucket is None:
+                        symbol_references[symbol] = [occ]
+                    else:
+                        bucket.append(occ)
 
         logger.info(
             f"索引构建完成: {len(self.documents)} 个文档, "
             f"{total_symbols} 个符号, {total_occurrences} 个出现位置"
         )
-        logger.debug(f"符号索引包含 {len(self._symbol_index)} 个唯一符号")
+        logger.debug(f"符号索引包含 {len(symbol_index)} 个唯一符号")
+
+    def defer_indexes(self) -> None:
+        """推迟索引构建,直到首个依赖索引的查询
+
+        只做解析、按路径遍历文档等不触及索引的工作流因此无需承担构建开销。
+        """
+        self._indexes_pending = True
+
+    def _indexes(self) -> _Indexes:
+        """返回内部查找表;若索引构建被推迟,则在此时一次性构建"""
+        if self._indexes_pending:
+            self.build_indexes()
+        return self._idx
 
     def get_symbol_info(self, symbol: str) -> SymbolInformation | None:
         """获取符号信息
@@ -611,7 +898,7 @@ class Index:
         Returns:
             符号信息对象，如果未找到则返回 None
         """
-        return self._symbol_info_index.get(symbol)
+        return self._indexes().symbol_info.get(symbol)
 
     def get_document(self, path: str) -> Document | None:
         """获取指定路径的文档
@@ -622,7 +909,7 @@ class Index:
         Returns:
             Document 对象,如果未找到则返回 None
         """
-        return self._document_index.get(path)
+        return self._indexes().documents.get(path)
 
     def get_document_by_symbol(self, symbol: str) -> Document | None:
         """获取定义该符号的文档
@@ -633,7 +920,7 @@ class Index:
         Returns:
             Document 对象,如果未找到则返回 None
         """
-        return self._symbol_to_doc_index.get(symbol)
+        return self._indexes().symbol_to_doc.get(symbol)
 
     def get_symbol_occurrences(self, symbol: str) -> list[Occurrence]:
         """获取符号的所有出现位置
@@ -644,7 +931,7 @@ class Index:
         Returns:
             该符号的所有出现位置列表
         """
-        return self._symbol_index.get(symbol, [])
+        return self._indexes().symbol_index.get(symbol, [])
 
     def list_symbols(self) -> set[str]:
         """列出索引中的所有符号
@@ -652,16 +939,16 @@ class Index:
         Returns:
             符号集合
         """
-        return set(self._symbol_index.keys())
+        return set(self._indexes().symbol_index.keys())
 
-    def get_all_definitions(self) -> list[dict]:
+    def get_all_definitions(self) -> list[Definition]:
         """获取所有符号定义
 
         这是一个便捷方法，用于获取索引中所有符号的定义信息。
-        返回的字典包含了符号的基本信息，无需了解 SCIP 协议细节。
+        返回的 Definition 记录包含了符号的基本信息，无需了解 SCIP 协议细节。
 
         Returns:
-            包含所有定义信息的字典列表，每个字典包含:
+            Definition 列表，每条记录包含(可按属性或按键访问):
             - symbol: 符号字符串
             - display_name: 显示名称
             - kind: 符号类型 (SymbolKind 枚举)
@@ -675,27 +962,53 @@ class Index:
             >>> index = parser.parse_file("project.scip")
             >>> definitions = index.get_all_definitions()
             >>> for d in definitions:
-            ...     print(f"{d['display_name']} - {d['kind_name']}")
+            ...     print(f"{d.display_name} - {d.kind_name}")
         """
-        definitions = []
+        return list(self._load_definitions())
+
+    def _load_definitions(self) -> list[Definition]:
+        """构建并缓存定义列表,同时按类型和(小写)语言分桶
 
+        Returns:
+            缓存的定义列表(调用方不应修改)
+        """
+        if self._all_definitions is not None:
+            return self._all_definitions
+
+        definitions: list[Definition] = []
+        by_kind: dict[SymbolKind, list[Definition]] = {}
+        by_language: dict[str, list[Definition]] = {}
+
+        # 直接用 tuple.__new__ 构造,跳过 NamedTuple 生成的 Python 层 __new__
+        new_definition = tuple.__new__
         for document in self.documents:
+            relative_path = document.relative_path
+            language = document.language
+            language_bucket = by_language.setdefault(language.lower(), [])
             for symbol_str, symbol_info in document.symbols.items():
-                definitions.append(
-                    {
-                        "symbol": symbol_str,
-                        "display_name": symbol_info.display_name,
-                        "kind": symbol_info.kind,
-                        "kind_name": symbol_info.kind.name,
-                        "document": document.relative_path,
-                        "language": document.language,
-                        "documentation": symbol_info.documentation,
-                    }
+                kind = symbol_info.kind
+                definition = new_definition(
+                    Definition,
+                    (
+                        symbol_str,
+                        symbol_info.display_name,
+                        kind,
+                        kind.name,
+                        relative_path,
+                        language,
+                        symbol_info.documentation,
+                    ),
                 )
+                definitions.append(definition)
+                language_bucket.append(definition)
+                by_kind.setdefault(kind, []).append(definition)
 
+        self._definitions_by_kind = by_kind
+        self._definitions_by_language = by_language
+        self._all_definitions = definitions
         return definitions
 
-    def get_definitions_by_kind(self, kind: SymbolKind) -> list[dict]:
+    def get_definitions_by_kind(self, kind: SymbolKind) -> list[Definition]:
         """按符号类型获取定义
 
         Args:
@@ -709,9 +1022,10 @@ class Index:
             >>> functions = index.get_definitions_by_kind(SymbolKind.Function)
             >>> print(f"找到 {len(functions)} 个函数")
         """
-        return [d for d in self.get_all_definitions() if d["kind"] == kind]
+        self._load_definitions()
+        return list(self._definitions_by_kind.get(kind, ()))
 
-    def get_functions(self) -> list[dict]:
+    def get_functions(self) -> list[Definition]:
         """获取所有函数定义
 
         Returns:
@@ -724,7 +1038,7 @@ class Index:
         """
         return self.get_definitions_by_kind(SymbolKind.Function)
 
-    def get_methods(self) -> list[dict]:
+    def get_methods(self) -> list[Definition]:
         """获取所有方法定义
 
         Returns:
@@ -732,7 +1046,7 @@ class Index:
         """
         return self.get_definitions_by_kind(SymbolKind.Method)
 
-    def get_classes(self) -> list[dict]:
+    def get_classes(self) -> list[Definition]:
         """获取所有类定义
 
         Returns:
@@ -745,7 +1059,7 @@ class Index:
         """
         return self.get_definitions_by_kind(SymbolKind.Class)
 
-    def get_interfaces(self) -> list[dict]:
+    def get_interfaces(self) -> list[Definition]:
         """获取所有接口定义
 
         Returns:
@@ -753,14 +1067,15 @@ class Index:
         """
         return self.get_definitions_by_kind(SymbolKind.Interface)
 
-    def get_definitions_by_kinds(self, kinds: list[SymbolKind]) -> list[dict]:
+    def get_definitions_by_kinds(self, kinds: list[SymbolKind]) -> list[Definition]:
         """按多个符号类型获取定义
 
         Args:
             kinds: SymbolKind 枚举值列表
 
         Returns:
-            符合任一类型的定义列表
+            符合任一类型的定义列表,按 kinds 中首次出现的类型顺序分组,
+            组内保持文档顺序
 
         Example:
             >>> # 获取所有函数和方法
@@ -769,10 +1084,14 @@ class Index:
             ...     SymbolKind.Method
             ... ])
         """
-        kind_set = set(kinds)
-        return [d for d in self.get_all_definitions() if d["kind"] in kind_set]
+        self._load_definitions()
+        by_kind = self._definitions_by_kind
+        # 直接拼接各类型的桶,重复的类型只取一次
+        return list(
+            itertools.chain.from_iterable(by_kind.get(kind, ()) for kind in dict.fromkeys(kinds))
+        )
 
-    def get_definitions_by_language(self, language: str) -> list[dict]:
+    def get_definitions_by_language(self, language: str) -> list[Definition]:
         """按编程语言获取定义
 
         Args:
@@ -785,8 +1104,8 @@ class Index:
             >>> # 获取所有 Python 文件中的定义
             >>> python_defs = index.get_definitions_by_language("python")
         """
-        language_lower = language.lower()
-        return [d for d in self.get_all_definitions() if d["language"].lower() == language_lower]
+        self._load_definitions()
+        return list(self._definitions_by_language.get(language.lower(), ()))
 
     def get_statistics(self) -> IndexStatistics:
         """获取统计信息
@@ -797,24 +1116,27 @@ class Index:
         from collections import Counter
 
         language_dist: Counter[str] = Counter()
-        kind_dist: Counter[str] = Counter()
+        # 先按枚举成员计数,最后只对出现过的种类取一次 .name
+        kind_counts: Counter[SymbolKind] = Counter()
+        count_kinds = kind_counts.update
         total_symbols = 0
         total_occurrences = 0
 
         for doc in self.documents:
-            total_symbols += len(doc.symbols)
+            symbols = doc.symbols
+            total_symbols += len(symbols)
             total_occurrences += len(doc.occurrences)
             language_dist[doc.language] += 1
+            count_kinds([symbol_info.kind for symbol_info in symbols.values()])
 
-            for symbol_info in doc.symbols.values():
-                kind_dist[symbol_info.kind.name] += 1
+        kind_dist = {kind.name: count for kind, count in kind_counts.items()}
 
         return {
             "total_documents": len(self.documents),
             "total_symbols": total_symbols,
             "total_occurrences": total_occurrences,
             "language_distribution": dict(language_dist),
-            "kind_distribution": dict(kind_dist),
+            "kind_distribution": kind_dist,
         }
 
     def find_symbols_by_name(self, name: str, exact_match: bool = False) -> list[SymbolInformation]:
@@ -827,16 +1149,13 @@ class Index:
         Returns:
             符号信息列表
         """
-        # 如果索引已构建，使用 _symbol_info_index 优化查询
-        if self._symbol_info_index:
+        symbol_info_index = self._indexes().symbol_info
+        # 如果索引已构建，使用符号信息索引优化查询
+        if symbol_info_index:
             if exact_match:
-                return [
-                    info for info in self._symbol_info_index.values() if info.display_name == name
-                ]
+                return [info for info in symbol_info_index.values() if info.display_name == name]
             else:
-                return [
-                    info for info in self._symbol_info_index.values() if name in info.display_name
-                ]
+                return [info for info in symbol_info_index.values() if name in info.display_name]
 
         # 回退到线性遍历
         results = []
@@ -860,12 +1179,15 @@ class Index:
             符号信息列表
         """
         query_lower = query.lower()
-        # 如果索引已构建，使用 _symbol_info_index 优化查询
-        if self._symbol_info_index:
+        # 如果索引已构建，使用预先转为小写的检索键查询
+        if self._indexes().symbol_info:
+            infos = self._load_search_keys()
             return [
-                info
-                for info in self._symbol_info_index.values()
-                if query_lower in info.display_name.lower() or query_lower in info.symbol.lower()
+                infos[i]
+                for i, (display_lower, symbol_lower) in enumerate(
+                    zip(self._search_display_lower, self._search_symbol_lower)
+                )
+                if query_lower in display_lower or query_lower in symbol_lower
             ]
 
         # 回退到线性遍历
@@ -879,6 +1201,21 @@ class Index:
                     results.append(symbol_info)
         return results
 
+    def _load_search_keys(self) -> list[SymbolInformation]:
+        """构建并缓存 search_symbols 所用的小写显示名和符号字符串
+
+        Returns:
+            与小写键列表平行的符号信息列表(调用方不应修改)
+        """
+        if self._search_infos is not None:
+            return self._search_infos
+
+        infos = list(self._idx.symbol_info.values())
+        self._search_display_lower = [info.display_name.lower() for info in infos]
+        self._search_symbol_lower = [info.symbol.lower() for info in infos]
+        self._search_infos = infos
+        return infos
+
     def find_references(self, symbol: str) -> list[Occurrence]:
         """查找符号引用
 
@@ -889,8 +1226,7 @@ class Index:
             引用列表
         """
         logger.debug(f"查找符号引用: {symbol}")
-        occurrences = self.get_symbol_occurrences(symbol)
-        references = [occ for occ in occurrences if occ.is_reference]
+        references = list(self._indexes().references.get(symbol, ()))
         logger.debug(f"找到 {len(references)} 个引用")
         return references
 
@@ -904,13 +1240,12 @@ class Index:
             定义出现位置
         """
         logger.debug(f"查找符号定义: {symbol}")
-        occurrences = self.get_symbol_occurrences(symbol)
-        for occ in occurrences:
-            if occ.is_definition:
-                logger.debug(f"找到定义: {symbol} 在 {occ.range}")
-                return occ
-        logger.debug(f"未找到定义: {symbol}")
-        return None
+        occ = self._indexes().definitions.get(symbol)
+        if occ is None:
+            logger.debug(f"未找到定义: {symbol}")
+        else:
+            logger.debug(f"找到定义: {symbol} 在 {occ.range}")
+        return occ
 
     def find_implementations(self, symbol: str) -> list[str]:
         """查找实现
@@ -921,12 +1256,7 @@ class Index:
         Returns:
             实现该符号的符号列表
         """
-        implementations = []
-        for info in self._symbol_info_index.values():
-            for rel in info.relationships:
-                if rel.is_implementation and rel.symbol == symbol:
-                    implementations.append(info.symbol)
-        return implementations
+        return list(self._load_implementations().get(symbol, ()))
 
     def find_subtypes(self, symbol: str) -> list[str]:
         """查找子类型
@@ -937,12 +1267,31 @@ class Index:
         Returns:
             子类型符号列表
         """
-        subtypes = []
-        for info in self._symbol_info_index.values():
+        return list(self._load_implementations().get(symbol, ()))
+
+    def _load_implementations(self) -> dict[str, list[str]]:
+        """构建并缓存反向实现关系索引
+
+        一次遍历所有符号的关系,按被实现的符号归集实现者,顺序与逐个扫描时一致。
+
+        Returns:
+            被实现的符号到实现者列表的映射(调用方不应修改)
+        """
+        symbol_info = self._indexes().symbol_info
+        if self._implementations_of is not None:
+            return self._implementations_of
+
+        implementations_of: dict[str, list[str]] = {}
+        for info in symbol_info.values():
             for rel in info.relationships:
-                if rel.is_implementation and rel.symbol == symbol:
-                    subtypes.append(info.symbol)
-        return subtypes
+                if rel.is_implementation:
+                    implementers = implementations_of.get(rel.symbol)
+                    if implementers is None:
+                        implementations_of[rel.symbol] = [info.symbol]
+                    else:
+                        implementers.append(info.symbol)
+        self._implementations_of = implementations_of
+        return implementations_of
 
     def find_supertypes(self, symbol: str) -> list[str]:
         """查找超类型
@@ -953,13 +1302,10 @@ class Index:
         Returns:
             超类型符号列表
         """
-        supertypes = []
         info = self.get_symbol_info(symbol)
-        if info:
-            for rel in info.relationships:
-                if rel.is_implementation:
-                    supertypes.append(rel.symbol)
-        return supertypes
+        if info is None:
+            return []
+        return info.get_relationships("implementation")
 
     def find_callees(self, symbol: str) -> list[str]:
         """查找被调用者
@@ -970,41 +1316,42 @@ class Index:
         Returns:
             被调用者符号列表
         """
-        callees = set()
+        cached = self._callees_cache.get(symbol)
+        if cached is None:
+            cached = self._callees_cache[symbol] = self._compute_callees(symbol)
+        return list(cached)
+
+    def _compute_callees(self, symbol: str) -> tuple[str, ...]:
+        """计算 find_callees 的结果(未缓存)"""
         definition = self.find_definition(symbol)
         if not definition:
-            return []
-
-        doc_path = None
-        start_line = definition.get_start_line()
-        end_line = definition.get_end_line()
+            return ()
 
+        # 定位定义该符号的文档及其定义范围
+        doc = None
+        doc_definition = None
         for cur_doc in self.documents:
             if symbol in cur_doc.symbols:
-                for occ in cur_doc.occurrences:
-                    if occ.symbol == symbol and occ.is_definition:
-                        doc_path = cur_doc.relative_path
-                        start_line = occ.get_start_line()
-                        end_line = occ.get_end_line()
-                        break
-            if doc_path:
-                break
+                doc_definition = cur_doc.find_definition(symbol)
+                if doc_definition is not None:
+                    doc = cur_doc
+                    break
 
-        if not doc_path:
-            return []
+        if doc is None or doc_definition is None:
+            return ()
 
-        doc = self.get_document(doc_path)
-        if doc is None:
-            return []
+        start_line = doc_definition.get_start_line()
+        end_line = doc_definition.get_end_line()
 
-        for occ in doc.occurrences:
-            occ_start = occ.get_start_line()
-            occ_end = occ.get_end_line()
-            if not (occ_end < start_line or occ_start > end_line):
-                if occ.is_reference and occ.symbol != symbol:
-                    callees.add(occ.symbol)
+        columns = doc._columns or doc._load_columns()
+        symbols = columns.symbols
+        roles = columns.roles
+        callees = set()
+        for i in doc._overlapping_indices(start_line, end_line):
+            if not roles[i] & _ROLE_DEFINITION and symbols[i] != symbol:
+                callees.add(symbols[i])
 
-        return list(callees)
+        return tuple(callees)
 
     def find_callers(self, symbol: str) -> list[str]:
         """查找调用者
@@ -1039,25 +1386,36 @@ class Index:
         """
         import collections
 
-        queue = collections.deque([(from_symbol, [from_symbol])])
-        visited = {from_symbol}
+        # 入队即标记(parent 中已有的节点不再入队),每个符号最多展开一次;
+        # 记录前驱而非复制整条路径,命中后再回溯出路径
+        parent: dict[str, str | None] = {from_symbol: None}
+        queue = collections.deque([(from_symbol, 1)])
         max_depth = 10
 
+        def build_path(node: str) -> list[str]:
+            path = []
+            current: str | None = node
+            while current is not None:
+                path.append(current)
+                current = parent[current]
+            path.reverse()
+            return path
+
         while queue:
-            current, path = queue.popleft()
-            if len(path) > max_depth:
+            current, depth = queue.popleft()
+            if depth > max_depth:
                 continue
 
             if current == to_symbol:
-                return path
+                return build_path(current)
 
-            callees = self.find_callees(current)
-            for callee in callees:
+            for callee in self.find_callees(current):
+                if callee in parent:
+                    continue
+                parent[callee] = current
                 if callee == to_symbol:
-                    return path + [callee]
-                if callee not in visited:
-                    visited.add(callee)
-                    queue.append((callee, path + [callee]))
+                    return build_path(callee)
+                queue.append((callee, depth + 1))
 
         return None
 
@@ -1071,11 +1429,14 @@ class Index:
             符号信息列表
         """
         import fnmatch
+        import re
 
+        # 模式在循环中不变,预先编译一次
+        match = re.compile(fnmatch.translate(pattern)).match
         results = []
         for doc in self.documents:
             for symbol_info in doc.symbols.values():
-                if fnmatch.fnmatch(symbol_info.display_name, pattern):
+                if match(symbol_info.display_name):
                     results.append(symbol_info)
         return results
 
@@ -1099,21 +1460,15 @@ class Index:
 
         function_lengths = []
         class_count = 0
-
-        function_kinds = {
-            SymbolKind.Function,
-            SymbolKind.Method,
-            SymbolKind.Constructor,
-            SymbolKind.StaticMethod,
-            SymbolKind.AbstractMethod,
-        }
+        # 直接查定义索引,避免经 find_definition 逐次格式化调试日志
+        definitions = self._indexes().definitions
 
         for doc in docs:
             for symbol, info in doc.symbols.items():
-                if info.kind == SymbolKind.Class:
+                if info.kind is SymbolKind.Class:
                     class_count += 1
-                elif info.kind in function_kinds:
-                    definition = self.find_definition(symbol)
+                elif info.kind in _FUNCTION_KINDS:
+                    definition = definitions.get(symbol)
                     if definition:
                         length = definition.get_end_line() - definition.get_start_line() + 1
                         function_lengths.append(length)
@@ -1138,25 +1493,26 @@ class Index:
         """
         from collections import Counter
 
-        counts: Counter[str] = Counter()
-        for doc in self.documents:
-            for occ in doc.occurrences:
-                if occ.is_reference and occ.symbol:
-                    counts[occ.symbol] += 1
-
-        defined_symbols = self._symbol_info_index.keys()
-        result = [(s, c) for s, c in counts.items() if s in defined_symbols]
-        result.sort(key=lambda x: x[1], reverse=True)
-
+        idx = self._indexes()
+        symbol_info = idx.symbol_info
+        references = idx.references
+        hotspots = self._hotspots
+        if hotspots is None:
+            # 引用次数直接取自索引中的引用桶,只保留已定义的符号;排序稳定,
+            # 同频次时保持首次被引用的顺序
+            counts = Counter({s: len(refs) for s, refs in references.items() if s in symbol_info})
+            hotspots = self._hotspots = counts.most_common()
+
+        result = hotspots[:n]
         if len(result) < n:
-            seen = set(counts.keys())
-            for sym in defined_symbols:
-                if sym not in seen:
+            # 不足 n 个时用未被引用的已定义符号补齐(引用次数为 0)
+            for sym in symbol_info:
+                if sym not in references:
                     result.append((sym, 0))
                     if len(result) >= n:
                         break
 
-        return result[:n]
+        return result
 
     def find_dead_code(self, exclude_patterns: list[str] | None = None) -> list[str]:
         """查找未被引用的定义 (死代码)
@@ -1168,23 +1524,21 @@ class Index:
             未被引用的符号标识符列表
         """
         import fnmatch
+        import re
 
         dead_code = []
         default_excludes = ["*__init__*", "*main*", "*test*", "*Test*"]
         excludes = exclude_patterns or default_excludes
+        # 所有排除模式合并为一个预编译的正则,每个符号只匹配一次
+        is_excluded = re.compile(
+            "|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in excludes)
+        ).match
+        # 被引用过的符号集合即引用桶的键,成员判断为 O(1)
+        referenced = self._indexes().references
 
         for doc in self.documents:
             for symbol in doc.symbols:
-                is_excluded = False
-                for pattern in excludes:
-                    if fnmatch.fnmatch(symbol, pattern):
-                        is_excluded = True
-                        break
-                if is_excluded:
-                    continue
-
-                refs = self.find_references(symbol)
-                if not refs:
+                if symbol not in referenced and not is_excluded(symbol):
                     dead_code.append(symbol)
 
         return dead_code
@@ -1224,13 +1578,8 @@ class Index:
         if not doc:
             return []
 
-        result = []
-        for occ in doc.occurrences:
-            occ_start = occ.get_start_line()
-            occ_end = occ.get_end_line()
-            if not (occ_end < start_line or occ_start > end_line):
-                result.append(occ)
-        return result
+        occurrences = doc.occurrences
+        return [occurrences[i] for i in doc._overlapping_indices(start_line, end_line)]
 
     def get_symbols_at_line(self, doc_path: str, line: int) -> list[Occurrence]:
         """获取指定文档中指定行的符号
@@ -27,3 +27,26 @@ class LanguageAdapter(Protocol):
             丰富后的符号信息（可能是新的对象）
         """
         ...
+
+
+@runtime_checkable
+class BatchLanguageAdapter(LanguageAdapter, Protocol):
+    """支持批量补全的语言适配器协议
+
+    适配器可一次性处理同一文档中的多个符号（例如只解析一次源码），
+    `SourceEnricher.enrich_document` 会优先使用该接口。
+    """
+
+    def enrich_batch(
+        self, symbols: list[SymbolInformation], source_code: str
+    ) -> list[SymbolInformation]:
+        """批量丰富同一文档中的符号信息
+
+        Args:
+            symbols: 原始符号信息列表
+            source_code: 源代码内容
+
+        Returns:
+            丰富后的符号信息列表，顺序与输入一致
+        """
+        ...
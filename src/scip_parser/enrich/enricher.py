@@ -4,10 +4,8 @@
 
 from __future__ import annotations
 
-import os
-
 from scip_parser.core.types import SymbolInformation
-from scip_parser.enrich.adapter import LanguageAdapter
+from scip_parser.enrich.adapter import BatchLanguageAdapter, LanguageAdapter
 from scip_parser.enrich.provider import SourceProvider
 
 
@@ -37,8 +35,7 @@ class SourceEnricher:
         Returns:
             丰富后的符号信息
         """
-        _, ext = os.path.splitext(document_path)
-        adapter = self._adapters.get(ext)
+        adapter = self._get_adapter(document_path)
         if not adapter:
             return symbol
 
@@ -47,3 +44,45 @@ class SourceEnricher:
             return symbol
 
         return adapter.enrich(symbol, source_code)
+
+    def enrich_document(
+        self, symbols: list[SymbolInformation], document_path: str
+    ) -> list[SymbolInformation]:
+        """批量丰富同一文档中的符号信息
+
+        适配器和源码只查找/读取一次；适配器实现了 `enrich_batch` 时整批交给它处理。
+
+        Args:
+            symbols: 原始符号信息列表
+            document_path: 文档相对路径
+
+        Returns:
+            丰富后的符号信息列表，顺序与输入一致
+        """
+        adapter = self._get_adapter(document_path)
+        if not adapter or not symbols:
+            return list(symbols)
+
+        source_code = self.provider.get_content(document_path)
+        if source_code is None:
+            return list(symbols)
+
+        if isinstance(adapter, BatchLanguageAdapter):
+            return adapter.enrich_batch(list(symbols), source_code)
+        return [adapter.enrich(symbol, source_code) for symbol in symbols]
+
+    def _get_adapter(self, document_path: str) -> LanguageAdapter | None:
+        """按文件扩展名查找适配器"""
+        return self._adapters.get(_extension(document_path))
+
+
+def _extension(document_path: str) -> str:
+    """提取文件扩展名 (等价于 posix 下的 os.path.splitext(path)[1])
+
+    SCIP 文档路径始终使用 "/" 分隔；文件名开头的 "." 不视为扩展名 (如 ".gitignore")。
+    """
+    name = document_path.rpartition("/")[2]
+    dot = name.rfind(".")
+    if dot > 0 and name[:dot].lstrip("."):
+        return name[dot:]
+    return ""
@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import os
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from typing import Optional
 
 
@@ -26,13 +27,45 @@ class SourceProvider(ABC):
 
 
 class FileSystemSourceProvider(SourceProvider):
-    """基于文件系统的源码提供者"""
+    """基于文件系统的源码提供者
 
-    def __init__(self, project_root: str):
+    读取结果按路径做 LRU 缓存，并以文件的修改时间 (mtime) 校验，
+    同一文件被多次请求时只读取一次磁盘，文件变更后自动重新读取。
+    """
+
+    def __init__(self, project_root: str, cache_size: int = 256):
         self.project_root = project_root
+        self.cache_size = cache_size
+        # relative_path -> (st_mtime_ns, content); most recently used entries at the end
+        self._cache: OrderedDict[str, tuple[int, Optional[str]]] = OrderedDict()
 
     def get_content(self, relative_path: str) -> Optional[str]:
         full_path = os.path.join(self.project_root, relative_path)
+        try:
+            mtime_ns = os.stat(full_path).st_mtime_ns
+        except OSError:
+            self._cache.pop(relative_path, None)
+            return None
+
+        cached = self._cache.get(relative_path)
+        if cached is not None and cached[0] == mtime_ns:
+            self._cache.move_to_end(relative_path)
+            return cached[1]
+
+        content = self._read(full_path)
+        if self.cache_size > 0:
+            self._cache[relative_path] = (mtime_ns, content)
+            self._cache.move_to_end(relative_path)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return content
+
+    def clear_cache(self) -> None:
+        """清空文件内容缓存"""
+        self._cache.clear()
+
+    @staticmethod
+    def _read(full_path: str) -> Optional[str]:
         try:
             with open(full_path, "r", encoding="utf-8") as f:
                 return f.read()
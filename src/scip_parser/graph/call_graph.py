@@ -4,18 +4,106 @@
 
 from __future__ import annotations
 
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
 import networkx as nx
 
-from scip_parser.core.types import Index
+from scip_parser.core.types import Index, Occurrence
+
+# Below this many documents the process pool start-up and pickling cost more than they save
+_PARALLEL_MIN_DOCUMENTS = 64
+
+
+def _document_call_edges(
+    occurrences: Sequence[Occurrence],
+) -> tuple[list[str], list[tuple[str, str]]]:
+    """计算单个文档内的调用边
+
+    Args:
+        occurrences: 文档的符号出现位置序列
+
+    Returns:
+        (节点列表, (调用者, 被调用者) 边列表)，均按首次出现顺序去重
+    """
+    nodes: dict[str, None] = {}
+    edges: dict[tuple[str, str], None] = {}
+
+    # Split occurrences: definitions sorted by (start, document order); the
+    # document index breaks ties exactly like the previous stable sort did
+    def_keys: list[tuple[int, int, int]] = []
+    def_ends: list[tuple[int, int]] = []
+    def_syms: list[str] = []
+    refs: list[tuple[tuple[int, int, int], str]] = []
+    for i, occ in enumerate(occurrences):
+        key = (occ.get_start_line(), occ.get_start_char(), i)
+        if occ.is_definition:
+            def_keys.append(key)
+            def_ends.append((occ.get_end_line(), occ.get_end_char()))
+            def_syms.append(occ.symbol)
+        elif occ.is_reference:
+            refs.append((key, occ.symbol))
+
+    order = sorted(range(len(def_keys)), key=def_keys.__getitem__)
+    def_keys = [def_keys[i] for i in order]
+    def_ends = [def_ends[i] for i in order]
+    def_syms = [def_syms[i] for i in order]
+    # Keys are unique (they end with the document index), so symbols are never compared
+    refs.sort()
+
+    # parent[i]: enclosing definition of definition i (-1 at top level), from one
+    # stack pass; a scope is closed once a later start reaches its (exclusive) end
+    parent: list[int] = []
+    stack: list[int] = []
+    for i, (line, char, _) in enumerate(def_keys):
+        while stack and def_ends[stack[-1]] <= (line, char):
+            stack.pop()
+        parent.append(stack[-1] if stack else -1)
+        stack.append(i)
+
+    # Innermost enclosing definition of a reference: the last definition that
+    # starts before it, then walk up parents past scopes that already ended
+    callers: list[int] = []
+    for key, _ in refs:
+        idx = bisect_right(def_keys, key) - 1
+        pos = key[:2]
+        while idx >= 0 and def_ends[idx] <= pos:
+            idx = parent[idx]
+        callers.append(idx)
+
+    # Emit nodes and edges in source position order, merging definitions and
+    # references, so graph insertion order (and DOT output) follows the source
+    r = 0
+    n_refs = len(refs)
+    n_defs = len(def_keys)
+    for i in range(n_defs + 1):
+        while r < n_refs and (i == n_defs or refs[r][0] < def_keys[i]):
+            caller = callers[r]
+            if caller >= 0:
+                callee = refs[r][1]
+                nodes[callee] = None
+                edges[(def_syms[caller], callee)] = None
+            r += 1
+        if i < n_defs:
+            nodes[def_syms[i]] = None
+
+    return list(nodes), list(edges)
 
 
 class CallGraphBuilder:
     """调用图构建器"""
 
-    def __init__(self, index: Index):
+    def __init__(self, index: Index, workers: int = 1):
+        """初始化调用图构建器
+
+        Args:
+            index: SCIP 索引
+            workers: 构建调用图使用的进程数(默认 1,即不启用多进程)
+        """
         self.index = index
+        self.workers = workers
         self.graph: nx.DiGraph = nx.DiGraph()
 
     def build(self) -> nx.DiGraph:
@@ -24,46 +112,29 @@ class CallGraphBuilder:
         Returns:
             NetworkX 有向图，节点为符号字符串，边表示调用关系
         """
-        # Ensure graph is clear if rebuilding? Or init new.
-        self.graph = nx.DiGraph()
+        documents = self.index.documents
+        results: Iterable[tuple[list[str], list[tuple[str, str]]]]
+        if self.workers > 1 and len(documents) > _PARALLEL_MIN_DOCUMENTS:
+            # Documents are independent; only their occurrences are sent to the workers
+            # (tuple() materializes lazily converted sequences so they can be pickled)
+            payloads = [tuple(doc.occurrences) for doc in documents]
+            chunksize = max(1, len(payloads) // (self.workers * 4))
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(_document_call_edges, payloads, chunksize=chunksize))
+        else:
+            results = (_document_call_edges(doc.occurrences) for doc in documents)
 
-        for doc in self.index.documents:
-            # Sort occurrences by start position
-            occurrences = sorted(
-                doc.occurrences, key=lambda o: (o.get_start_line(), o.get_start_char())
-            )
-
-            # Stack of (symbol, end_line, end_char)
-            scope_stack: list[tuple[str, int, int]] = []
-
-            for occ in occurrences:
-                # Check if we exited any scopes
-                while scope_stack:
-                    top_sym, top_end_line, top_end_char = scope_stack[-1]
-                    # Check if current occ starts AFTER the scope ends
-                    # SCIP ranges: start is inclusive, end is exclusive usually?
-                    # Types.py says "end_line, end_char".
-                    # If occ starts AT end position, it is outside if end is exclusive.
-                    # Assuming standard behavior: start >= end means outside.
-
-                    if occ.get_start_line() > top_end_line or (
-                        occ.get_start_line() == top_end_line
-                        and occ.get_start_char() >= top_end_char
-                    ):
-                        scope_stack.pop()
-                    else:
-                        break
-
-                if occ.is_definition:
-                    scope_stack.append((occ.symbol, occ.get_end_line(), occ.get_end_char()))
-                    self.graph.add_node(occ.symbol)
-
-                elif occ.is_reference:
-                    if scope_stack:
-                        caller = scope_stack[-1][0]
-                        callee = occ.symbol
-                        self.graph.add_edge(caller, callee)
+        # Merge per-document results in document order (dict keeps insertion order and
+        # dedupes repeated caller -> callee pairs), then bulk-insert into the graph once
+        nodes: dict[str, None] = {}
+        edges: dict[tuple[str, str], None] = {}
+        for doc_nodes, doc_edges in results:
+            nodes.update(dict.fromkeys(doc_nodes))
+            edges.update(dict.fromkeys(doc_edges))
 
+        self.graph = nx.DiGraph()
+        self.graph.add_nodes_from(nodes)
+        self.graph.add_edges_from(edges)
         return self.graph
 
     def get_callers(self, symbol: str) -> list[str]:
@@ -150,11 +221,10 @@ class CallGraphBuilder:
 
     def _write_dot(self, path: str):
         """写入 DOT 文件"""
+        # Assemble the whole file in memory and write it with a single call
+        lines = ["digraph G {\n", '  rankdir="LR";\n']
+        lines.extend(f'  "{node}" [label="{node.split()[-1]}"];\n' for node in self.graph.nodes())
+        lines.extend(f'  "{u}" -> "{v}";\n' for u, v in self.graph.edges())
+        lines.append("}\n")
         with open(path, "w", encoding="utf-8") as f:
-            f.write("digraph G {\n")
-            f.write('  rankdir="LR";\n')
-            for node in self.graph.nodes():
-                f.write(f'  "{node}" [label="{node.split()[-1]}"];\n')
-            for u, v in self.graph.edges():
-                f.write(f'  "{u}" -> "{v}";\n')
-            f.write("}\n")
+            f.write("".join(lines))
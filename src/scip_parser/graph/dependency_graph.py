@@ -81,16 +81,30 @@ class DependencyGraphBuilder:
         Returns:
             层级列表，每个元素是该层的模块路径列表
         """
-        graph_copy = self.graph.copy()
-        layers = []
-
-        while graph_copy.nodes():
-            layer = [node for node in graph_copy.nodes() if graph_copy.out_degree(node) == 0]
-            if not layer:
-                layers.append(list(graph_copy.nodes()))
-                break
-            layers.append(layer)
-            graph_copy.remove_nodes_from(layer)
+        # Kahn's algorithm over reversed edges: a node joins the next layer once all of
+        # its dependencies are layered; positions keep each layer in graph node order
+        graph = self.graph
+        position = {node: i for i, node in enumerate(graph)}
+        remaining = dict(graph.out_degree())
+        layers: list[list[str]] = []
+
+        current = [node for node, degree in remaining.items() if degree == 0]
+        placed = 0
+        while current:
+            layers.append(current)
+            placed += len(current)
+            next_layer = []
+            for node in current:
+                for dependent in graph.predecessors(node):
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        next_layer.append(dependent)
+            next_layer.sort(key=position.__getitem__)
+            current = next_layer
+
+        # Nodes left over sit on or behind a dependency cycle: report them as one layer
+        if placed < len(position):
+            layers.append([node for node, degree in remaining.items() if degree > 0])
 
         return layers
 
@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 
+from collections import deque
 from typing import Any, Optional, cast
 
 import networkx as nx
@@ -17,6 +18,10 @@ class InheritanceGraphBuilder:
     def __init__(self, index: Index):
         self.index = index
         self.graph: nx.DiGraph = nx.DiGraph()
+        # Memoized traversal results over the built graph; reset by build()
+        self._ancestors: dict[str, frozenset[str]] = {}
+        self._common_ancestors: dict[tuple[str, str], str | None] = {}
+        self._depths: dict[str, int] = {}
 
     def build(self) -> nx.DiGraph:
         """构建继承图
@@ -25,6 +30,9 @@ class InheritanceGraphBuilder:
             NetworkX 有向图，节点为符号，边表示继承关系 (Child -> Parent)
         """
         self.graph = nx.DiGraph()
+        self._ancestors = {}
+        self._common_ancestors = {}
+        self._depths = {}
 
         for doc in self.index.documents:
             for sym_info in doc.symbols.values():
@@ -78,10 +86,24 @@ class InheritanceGraphBuilder:
         if symbol1 not in self.graph or symbol2 not in self.graph:
             return None
 
+        key = (symbol1, symbol2)
+        if key in self._common_ancestors:
+            return self._common_ancestors[key]
+
         try:
-            return cast(str, nx.lowest_common_ancestor(self.graph, symbol1, symbol2))
+            result = cast(Optional[str], nx.lowest_common_ancestor(self.graph, symbol1, symbol2))
         except (nx.NetworkXError, nx.NodeNotFound):
-            return None
+            result = None
+        self._common_ancestors[key] = result
+        return result
+
+    def _load_ancestors(self, symbol: str) -> frozenset[str]:
+        """获取 symbol 的祖先集合 (按符号缓存)"""
+        ancestors = self._ancestors.get(symbol)
+        if ancestors is None:
+            ancestors = frozenset(nx.ancestors(self.graph, symbol))
+            self._ancestors[symbol] = ancestors
+        return ancestors
 
     def get_ancestors(self, symbol: str) -> list[str]:
         """获取所有祖先类/接口
@@ -94,7 +116,7 @@ class InheritanceGraphBuilder:
         """
         if symbol not in self.graph:
             return []
-        return list(nx.ancestors(self.graph, symbol))
+        return list(self._load_ancestors(symbol))
 
     def get_descendants(self, symbol: str) -> list[str]:
         """获取所有后代类/实现
@@ -121,15 +143,16 @@ class InheritanceGraphBuilder:
         if symbol not in self.graph:
             return []
 
+        # 广度优先:入队即标记,每个祖先只出现一次;deque.popleft 为 O(1)
         mro = []
-        visited = set()
-        queue = [symbol]
-        visited.add(symbol)
+        visited = {symbol}
+        queue = deque([symbol])
+        predecessors = self.graph.predecessors
 
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             mro.append(current)
-            for parent in self.get_parents(current):
+            for parent in predecessors(current):
                 if parent not in visited:
                     visited.add(parent)
                     queue.append(parent)
@@ -161,8 +184,14 @@ class InheritanceGraphBuilder:
             # 如果节点有多个父类，检查这些父类是否有共同的祖先
             if len(parents) >= 2:
                 # 检查所有父类对之间是否有共同祖先
+                # Each parent's ancestor set (including itself) is computed once; pairs
+                # with disjoint sets have no common ancestor and skip the LCA search
+                lineages = [self._load_ancestors(p) | {p} for p in parents]
                 for i, parent1 in enumerate(parents):
-                    for parent2 in parents[i + 1 :]:
+                    for j in range(i + 1, len(parents)):
+                        if lineages[i].isdisjoint(lineages[j]):
+                            continue
+                        parent2 = parents[j]
                         # 找到 parent1 和 parent2 的共同祖先
                         common_ancestor = self.find_common_ancestor(parent1, parent2)
 
@@ -200,41 +229,36 @@ class InheritanceGraphBuilder:
             return {"direct_depth": 0, "total_depth": 0, "class_count": 0}
 
         parents = self.get_parents(symbol)
-        direct_depth = len(parents)
 
-        # 计算到根节点的最长路径
+        # 到根节点的深度:各父类向上的层数取最大值再加 1
         total_depth = 0
         if parents:
-            max_parent_depth = 0
-            for parent in parents:
-                try:
-                    # 计算从 parent 到根节点的最长路径
-                    parent_depth = 0
-                    visited = set()
-                    current_parents = [parent]
-
-                    while current_parents:
-                        next_parents = []
-                        for p in current_parents:
-                            if p not in visited:
-                                visited.add(p)
-                                next_parents.extend(self.get_parents(p))
-                        if next_parents:
-                            parent_depth += 1
-                        current_parents = next_parents
-
-                    max_parent_depth = max(max_parent_depth, parent_depth)
-                except Exception:
-                    pass
-
-            total_depth = max_parent_depth + 1
-
-        # 计算祖先类数量
-        ancestors = self.get_ancestors(symbol)
-        class_count = len(ancestors)
+            total_depth = max(self._load_depth(parent) for parent in parents) + 1
 
         return {
-            "direct_depth": direct_depth,
+            "direct_depth": len(parents),
             "total_depth": total_depth,
-            "class_count": class_count,
+            "class_count": len(self._load_ancestors(symbol)),
         }
+
+    def _load_depth(self, symbol: str) -> int:
+        """获取从 symbol 向上逐层遍历祖先的层数 (按符号缓存)"""
+        depth = self._depths.get(symbol)
+        if depth is None:
+            depth = 0
+            visited = set()
+            current_parents = [symbol]
+            predecessors = self.graph.predecessors
+
+            while current_parents:
+                next_parents = []
+                for p in current_parents:
+                    if p not in visited:
+                        visited.add(p)
+                        next_parents.extend(predecessors(p))
+                if next_parents:
+                    depth += 1
+                current_parents = next_parents
+
+            self._depths[symbol] = depth
+        return depth
@@ -34,6 +34,9 @@ class PatternFilter(SymbolFilter):
         self.use_regex = use_regex
         if use_regex:
             self.regex = re.compile(pattern)
+        else:
+            # 通配符模式同样预先编译,避免每次匹配都经过 fnmatch
+            self.regex = re.compile(fnmatch.translate(pattern))
 
     def match(
         self,
@@ -44,7 +47,7 @@ class PatternFilter(SymbolFilter):
         name = symbol.display_name
         if self.use_regex:
             return bool(self.regex.search(name))
-        return fnmatch.fnmatch(name, self.pattern)
+        return self.regex.match(name) is not None
 
 
 class DocumentFilter(SymbolFilter):
@@ -52,6 +55,7 @@ class DocumentFilter(SymbolFilter):
 
     def __init__(self, pattern: str):
         self.pattern = pattern
+        self.regex = re.compile(fnmatch.translate(pattern))
 
     def match(
         self,
@@ -61,7 +65,7 @@ class DocumentFilter(SymbolFilter):
     ) -> bool:
         if not document:
             return False
-        return fnmatch.fnmatch(document.relative_path, self.pattern)
+        return self.regex.match(document.relative_path) is not None
 
 
 class RoleFilter(SymbolFilter):
@@ -10,6 +10,19 @@ from scip_parser.core.types import Descriptor, Package, SymbolKind
 
 _SIMPLE_ID_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_+-$")
 
+# 描述符后缀到符号类型的映射(infer_metadata 使用)
+_SUFFIX_TO_KIND: dict[int, SymbolKind] = {
+    Descriptor.NAMESPACE: SymbolKind.Namespace,
+    Descriptor.TYPE: SymbolKind.Type,
+    Descriptor.TERM: SymbolKind.Variable,
+    Descriptor.METHOD: SymbolKind.Method,
+    Descriptor.TYPE_PARAMETER: SymbolKind.TypeParameter,
+    Descriptor.PARAMETER: SymbolKind.Parameter,
+    Descriptor.META: SymbolKind.Unspecified,
+    Descriptor.MACRO: SymbolKind.Macro,
+    Descriptor.LOCAL: SymbolKind.Variable,
+}
+
 
 @dataclass(frozen=True)
 class ParsedSymbol:
@@ -352,17 +365,5 @@ class SymbolParser:
         last_desc = parsed.descriptors[-1]
         name = last_desc.name
 
-        suffix_to_kind = {
-            Descriptor.NAMESPACE: SymbolKind.Namespace,
-            Descriptor.TYPE: SymbolKind.Type,
-            Descriptor.TERM: SymbolKind.Variable,
-            Descriptor.METHOD: SymbolKind.Method,
-            Descriptor.TYPE_PARAMETER: SymbolKind.TypeParameter,
-            Descriptor.PARAMETER: SymbolKind.Parameter,
-            Descriptor.META: SymbolKind.Unspecified,
-            Descriptor.MACRO: SymbolKind.Macro,
-            Descriptor.LOCAL: SymbolKind.Variable,
-        }
-
-        kind = suffix_to_kind.get(last_desc.suffix, SymbolKind.Unspecified)
+        kind = _SUFFIX_TO_KIND.get(last_desc.suffix, SymbolKind.Unspecified)
         return name, kind
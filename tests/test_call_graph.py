@@ -105,3 +105,77 @@ def test_analyze_complexity(mock_index):
     assert metrics["B"]["out_degree"] == 1
     # C has out-degree 0
     assert metrics["C"]["out_degree"] == 0
+
+
+def test_build_nested_scopes():
+    # Outer [0,0 -> 10,0] contains Inner [2,0 -> 4,0]; refs inside Inner belong to Inner,
+    # refs after Inner ends fall back to Outer, refs after Outer are top level
+    occurrences = [
+        Occurrence(range=[0, 0, 10, 0], symbol="Outer", symbol_roles=SymbolRole.Definition),
+        Occurrence(range=[2, 0, 4, 0], symbol="Inner", symbol_roles=SymbolRole.Definition),
+        Occurrence(range=[3, 0, 3, 5], symbol="X", symbol_roles=SymbolRole.ReadAccess),
+        Occurrence(range=[4, 0, 4, 5], symbol="Y", symbol_roles=SymbolRole.ReadAccess),
+        Occurrence(range=[12, 0, 12, 5], symbol="Z", symbol_roles=SymbolRole.ReadAccess),
+    ]
+    doc = Document(
+        relative_path="nested.py", language="python", occurrences=occurrences, symbols={}
+    )
+    metadata = Metadata(version=1, tool_info=ToolInfo(name="test", version="1"), project_root="/")
+    graph = CallGraphBuilder(Index(metadata=metadata, documents=[doc])).build()
+
+    assert set(graph.edges()) == {("Inner", "X"), ("Outer", "Y")}
+    assert "Z" not in graph
+
+
+def test_build_preserves_source_order():
+    # Nodes are inserted in source position order, interleaving definitions and callees
+    occurrences = [
+        Occurrence(range=[0, 0, 5, 0], symbol="A", symbol_roles=SymbolRole.Definition),
+        Occurrence(range=[1, 0, 1, 5], symbol="X", symbol_roles=SymbolRole.ReadAccess),
+        Occurrence(range=[10, 0, 15, 0], symbol="B", symbol_roles=SymbolRole.Definition),
+        Occurrence(range=[11, 0, 11, 5], symbol="A", symbol_roles=SymbolRole.ReadAccess),
+    ]
+    doc = Document(relative_path="order.py", language="python", occurrences=occurrences, symbols={})
+    metadata = Metadata(version=1, tool_info=ToolInfo(name="test", version="1"), project_root="/")
+    graph = CallGraphBuilder(Index(metadata=metadata, documents=[doc])).build()
+
+    assert list(graph.nodes()) == ["A", "X", "B"]
+    assert list(graph.edges()) == [("A", "X"), ("B", "A")]
+
+
+def test_visualize_dot(mock_index, tmp_path):
+    builder = CallGraphBuilder(mock_index)
+    builder.build()
+
+    output = tmp_path / "calls.dot"
+    builder.visualize(str(output))
+
+    content = output.read_text(encoding="utf-8")
+    assert content.startswith('digraph G {\n  rankdir="LR";\n')
+    assert '  "A" [label="A"];\n' in content
+    assert '  "A" -> "B";\n' in content
+    assert '  "B" -> "C";\n' in content
+    assert content.endswith("}\n")
+
+
+def test_build_parallel_matches_serial():
+    documents = []
+    for i in range(70):
+        occurrences = [
+            Occurrence(range=[0, 0, 5, 0], symbol=f"f{i}", symbol_roles=SymbolRole.Definition),
+            Occurrence(range=[1, 0, 1, 5], symbol=f"f{i + 1}", symbol_roles=SymbolRole.ReadAccess),
+        ]
+        documents.append(
+            Document(
+                relative_path=f"m{i}.py", language="python", occurrences=occurrences, symbols={}
+            )
+        )
+    metadata = Metadata(version=1, tool_info=ToolInfo(name="test", version="1"), project_root="/")
+    index = Index(metadata=metadata, documents=documents)
+
+    serial = CallGraphBuilder(index).build()
+    parallel = CallGraphBuilder(index, workers=2).build()
+
+    assert list(parallel.nodes()) == list(serial.nodes())
+    assert list(parallel.edges()) == list(serial.edges())
+    assert parallel.has_edge("f0", "f1")
@@ -9,7 +9,7 @@ def test_real_index_loads_successfully(real_index):
 
 def test_real_index_has_symbols(real_index):
     """验证加载的索引包含符号数据"""
-    assert len(real_index._symbol_index) > 0
+    assert len(real_index.list_symbols()) > 0
 
 
 def test_real_index_metadata(real_index):
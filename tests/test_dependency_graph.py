@@ -112,3 +112,15 @@ def test_compute_stability_metrics(mock_index):
 
     assert metrics["a.py"]["instability"] == 1.0
     assert metrics["b.py"]["instability"] == 0.0
+
+
+def test_analyze_layers(mock_index):
+    builder = DependencyGraphBuilder(mock_index)
+    builder.build()
+
+    # b.py and c.py depend on nothing; a.py depends on b.py
+    assert builder.analyze_layers() == [["b.py", "c.py"], ["a.py"]]
+
+    # A cycle leaves its members unresolved; they are reported together as a final layer
+    builder.graph.add_edge("b.py", "a.py")
+    assert builder.analyze_layers() == [["c.py"], ["a.py", "b.py"]]
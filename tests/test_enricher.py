@@ -2,11 +2,12 @@
 测试 SourceEnricher 框架
 """
 
+import os
 from dataclasses import replace
 
 from scip_parser.core.types import SymbolInformation, SymbolKind
 from scip_parser.enrich.enricher import SourceEnricher
-from scip_parser.enrich.provider import SourceProvider
+from scip_parser.enrich.provider import FileSystemSourceProvider, SourceProvider
 
 
 class MockProvider(SourceProvider):
@@ -49,3 +50,86 @@ def test_enricher_flow():
     # 测试文件不存在
     unchanged_missing = enricher.enrich_symbol(symbol, "missing.go")
     assert unchanged_missing == symbol
+
+
+class MockBatchGoAdapter(MockGoAdapter):
+    def __init__(self):
+        self.batch_calls = 0
+
+    def enrich_batch(self, symbols: list[SymbolInformation], source_code: str):
+        self.batch_calls += 1
+        return [self.enrich(symbol, source_code) for symbol in symbols]
+
+
+def _make_symbols():
+    return [
+        SymbolInformation(
+            symbol=f"scip-go gomod pkg 1.0 {name}().",
+            kind=SymbolKind.Function,
+            display_name=name,
+            documentation=[],
+        )
+        for name in ("Test", "Other")
+    ]
+
+
+def test_enrich_document():
+    symbols = _make_symbols()
+
+    # Adapter without enrich_batch: falls back to per-symbol enrich
+    enricher = SourceEnricher(MockProvider())
+    enricher.register_adapter(".go", MockGoAdapter())
+    enriched = enricher.enrich_document(symbols, "test.go")
+    assert [s.documentation for s in enriched] == [["Title: Test API"]] * 2
+
+    # Batch-capable adapter receives the whole document in one call
+    batch_adapter = MockBatchGoAdapter()
+    enricher.register_adapter(".go", batch_adapter)
+    enriched = enricher.enrich_document(symbols, "test.go")
+    assert batch_adapter.batch_calls == 1
+    assert [s.documentation for s in enriched] == [["Title: Test API"]] * 2
+
+    # Unsupported or missing files return the symbols unchanged
+    assert enricher.enrich_document(symbols, "test.py") == symbols
+    assert enricher.enrich_document(symbols, "missing.go") == symbols
+
+
+def test_filesystem_provider_cache(tmp_path):
+    source = tmp_path / "main.go"
+    source.write_text("package main", encoding="utf-8")
+    provider = FileSystemSourceProvider(str(tmp_path))
+
+    assert provider.get_content("main.go") == "package main"
+
+    # Same mtime: served from the cache without re-reading the file
+    stat = os.stat(source)
+    source.write_text("package changed", encoding="utf-8")
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert provider.get_content("main.go") == "package main"
+
+    # Newer mtime: the cached entry is invalidated and the file is read again
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert provider.get_content("main.go") == "package changed"
+
+    assert provider.get_content("missing.go") is None
+
+
+def test_filesystem_provider_cache_eviction(tmp_path):
+    for name in ("a.go", "b.go"):
+        (tmp_path / name).write_text(name, encoding="utf-8")
+    provider = FileSystemSourceProvider(str(tmp_path), cache_size=1)
+
+    provider.get_content("a.go")
+    provider.get_content("b.go")
+    assert list(provider._cache) == ["b.go"]
+
+
+def test_adapter_lookup_by_extension():
+    enricher = SourceEnricher(MockProvider())
+    adapter = MockGoAdapter()
+    enricher.register_adapter(".go", adapter)
+
+    assert enricher._get_adapter("pkg/sub.dir/main.go") is adapter
+    # Leading dots and dotted directories are not extensions (same as os.path.splitext)
+    assert enricher._get_adapter("pkg/.go") is None
+    assert enricher._get_adapter("pkg.go/main") is None
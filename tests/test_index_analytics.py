@@ -150,6 +150,12 @@ def test_find_hotspots():
     assert hotspots[0] == ("A", 2)
     assert hotspots[1] == ("B", 1)
 
+    # 排序结果被缓存，不同的 n 直接切片；不足时以零引用的定义补齐
+    assert index.find_hotspots(n=1) == [("A", 2)]
+    doc1.symbols["C"] = SymbolInformation(symbol="C", kind=SymbolKind.Function, display_name="C")
+    index.build_indexes()
+    assert index.find_hotspots(n=5) == [("A", 2), ("B", 1), ("C", 0)]
+
 
 def test_find_dead_code():
     doc1 = Document(
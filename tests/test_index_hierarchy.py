@@ -68,12 +68,26 @@ def test_get_symbols_in_range(mock_index):
     assert "func_a()." in symbols
     assert "func_b()." in symbols
 
+    # 跨行的出现位置只要与查询范围相交即命中，结果保持文档顺序
+    syms = mock_index.get_symbols_in_range("main.py", 3, 12)
+    assert [s.symbol for s in syms] == ["func_a().", "func_b()."]
+    assert [s.symbol for s in mock_index.get_symbols_at_line("main.py", 2)] == [
+        "func_a().",
+        "func_b().",
+    ]
+    assert mock_index.get_symbols_in_range("main.py", 20, 30) == []
+
 
 def test_find_callees(mock_index):
     callees = mock_index.find_callees("func_a().")
     assert len(callees) == 1
     assert callees[0] == "func_b()."
 
+    # 结果被缓存，返回值为副本
+    callees.clear()
+    assert mock_index.find_callees("func_a().") == ["func_b()."]
+    assert mock_index.find_callees("missing().") == []
+
 
 def test_find_callers(mock_index):
     callers = mock_index.find_callers("func_b().")
@@ -77,3 +77,8 @@ def test_find_implementations(mock_index):
     assert impls[0] == "impl#"
 
     assert len(mock_index.find_implementations("impl#")) == 0
+
+    # 反向索引被缓存，返回值为副本
+    impls.clear()
+    assert mock_index.find_implementations("interface#") == ["impl#"]
+    assert mock_index.find_subtypes("interface#") == ["impl#"]
@@ -91,3 +91,48 @@ def test_search_symbols(mock_index):
     results = mock_index.search_symbols("helper")
     assert len(results) >= 1
     assert any(r.display_name == "Helper" for r in results)
+
+    # 重复查询复用小写检索键缓存，大小写不敏感
+    assert mock_index.search_symbols("HELPER") == results
+    assert mock_index.search_symbols("no-such-symbol") == []
+
+
+def test_definition_queries_are_cached(mock_index):
+    all_defs = mock_index.get_all_definitions()
+    assert [d["display_name"] for d in all_defs] == ["main", "Helper", "help"]
+
+    # 结果列表为副本，修改不会影响后续查询
+    all_defs.clear()
+    assert len(mock_index.get_all_definitions()) == 3
+
+    # 定义记录支持属性访问，也兼容按键访问
+    main_def = mock_index.get_functions()[0]
+    assert main_def.display_name == main_def["display_name"] == "main"
+    assert main_def.get("kind") is SymbolKind.Function
+    assert main_def.get("missing") is None
+    with pytest.raises(KeyError):
+        main_def["count"]
+
+    # in、keys/values/items 与字典形式保持一致,按字段名而非字段值判断
+    assert "display_name" in main_def
+    assert "main" not in main_def
+    assert "count" not in main_def
+    assert dict(main_def.items()) == main_def._asdict()
+    assert list(main_def.values()) == [main_def[k] for k in main_def.keys()]
+
+    assert [d["display_name"] for d in mock_index.get_functions()] == ["main"]
+    assert [d["display_name"] for d in mock_index.get_classes()] == ["Helper"]
+    assert mock_index.get_interfaces() == []
+    assert len(mock_index.get_definitions_by_language("Python")) == 3
+    assert mock_index.get_definitions_by_language("go") == []
+
+
+def test_definition_cache_reset_on_rebuild(mock_index):
+    assert len(mock_index.get_all_definitions()) == 3
+
+    # 文档变化后重新构建索引，定义缓存随之失效
+    mock_index.documents = mock_index.documents[:1]
+    mock_index.build_indexes()
+    assert [d.display_name for d in mock_index.get_all_definitions()] == ["main"]
+    assert mock_index.get_classes() == []
+    assert len(mock_index.get_definitions_by_language("python")) == 1
@@ -99,3 +99,18 @@ def test_find_common_ancestor(mock_index):
 
     ancestor = builder.find_common_ancestor("Base", "GrandChild")
     assert ancestor == "Base"
+
+
+def test_ancestor_caches_reset_on_build(mock_index):
+    builder = InheritanceGraphBuilder(mock_index)
+    builder.build()
+
+    assert set(builder.get_ancestors("GrandChild")) == {"Child", "Base", "I"}
+    assert builder.find_common_ancestor("Child", "GrandChild") == "Child"
+    # Repeated queries are served from the memoized results
+    assert set(builder.get_ancestors("GrandChild")) == {"Child", "Base", "I"}
+    assert ("Child", "GrandChild") in builder._common_ancestors
+
+    builder.build()
+    assert builder._ancestors == {}
+    assert builder._common_ancestors == {}
@@ -189,3 +189,40 @@ def test_edge_cases():
     assert builder.get_children("Missing") == []
     assert builder.get_ancestors("Missing") == []
     assert builder.analyze_depth("Missing")["total_depth"] == 0
+
+
+def _make_index(relationships: dict[str, list[str]]) -> Index:
+    symbols = {
+        name: SymbolInformation(
+            symbol=name,
+            kind=SymbolKind.Class,
+            display_name=name,
+            relationships=[Relationship(symbol=p, is_implementation=True) for p in parents],
+        )
+        for name, parents in relationships.items()
+    }
+    doc = Document(relative_path="classes.py", language="python", occurrences=[], symbols=symbols)
+    return Index(
+        metadata=Metadata(version=1, tool_info=ToolInfo(name="t", version="1"), project_root="/"),
+        documents=[doc],
+    )
+
+
+def test_analyze_depth_uses_longest_path():
+    # Leaf reaches Top directly and through Mid; the longer path determines the depth
+    index = _make_index({"Top": [], "Mid": ["Top"], "Leaf": ["Mid", "Top"]})
+    builder = InheritanceGraphBuilder(index)
+    builder.build()
+
+    depth = builder.analyze_depth("Leaf")
+    assert depth == {"direct_depth": 2, "total_depth": 2, "class_count": 2}
+
+
+def test_analyze_depth_with_cycle():
+    # Malformed cyclic hierarchy must still terminate; each parent's ancestors are walked
+    # level by level with a visited set, so the cycle adds levels until it is exhausted
+    builder = InheritanceGraphBuilder(_make_index({"Root": [], "X": ["Root", "Y"], "Y": ["X"]}))
+    builder.build()
+
+    assert builder.analyze_depth("X") == {"direct_depth": 2, "total_depth": 3, "class_count": 2}
+    assert builder.analyze_depth("Y") == {"direct_depth": 1, "total_depth": 3, "class_count": 2}
@@ -47,31 +47,36 @@ class TestSCIPParser:
         with pytest.raises(ValueError, match="Failed to parse SCIP index"):
             parser.parse_bytes(data)
 
-    def test_parse_file_normal(self):
+    def test_parse_file_normal(self, tmp_path):
         """测试解析普通文件"""
-        with patch("builtins.open", create=True) as mock_open:
-            # 模拟文件读取
-            pb_index = scip_pb2.Index()
-            pb_index.metadata.tool_info.name = "normal-file"
-            mock_file = MagicMock()
-            mock_file.read.return_value = pb_index.SerializeToString()
-            mock_file.__enter__.return_value = mock_file
-            mock_open.return_value = mock_file
+        pb_index = scip_pb2.Index()
+        pb_index.metadata.tool_info.name = "normal-file"
+        path = tmp_path / "test.scip"
+        path.write_bytes(pb_index.SerializeToString())
 
-            parser = SCIPParser()
-            index = parser.parse_file("test.scip")
+        parser = SCIPParser()
+        index = parser.parse_file(str(path))
+
+        assert index.metadata.tool_info.name == "normal-file"
 
-            assert index.metadata.tool_info.name == "normal-file"
-            mock_open.assert_called_once_with("test.scip", "rb")
+    def test_parse_file_empty(self, tmp_path):
+        """测试解析空文件(无法 mmap,回退到流读取)"""
+        path = tmp_path / "empty.scip"
+        path.write_bytes(b"")
+
+        parser = SCIPParser()
+        index = parser.parse_file(str(path))
+
+        assert len(index.documents) == 0
 
     def test_parse_file_gz(self):
         """测试解析 gzip 文件"""
-        with patch("gzip.open") as mock_gzip_open:
+        with patch("scip_parser.core.parser._gzip_impl.open") as mock_gzip_open:
             # 模拟 gzip 文件读取
             pb_index = scip_pb2.Index()
             pb_index.metadata.tool_info.name = "gzip-file"
             mock_file = MagicMock()
-            mock_file.read.return_value = pb_index.SerializeToString()
+            mock_file.read.side_effect = [pb_index.SerializeToString(), b""]
             mock_file.__enter__.return_value = mock_file
             mock_gzip_open.return_value = mock_file
 
@@ -81,6 +86,22 @@ class TestSCIPParser:
             assert index.metadata.tool_info.name == "gzip-file"
             mock_gzip_open.assert_called_once_with("test.scip.gz", "rb")
 
+    def test_parse_file_gz_real(self, tmp_path):
+        """测试解析真实的 gzip 文件"""
+        import gzip
+
+        pb_index = scip_pb2.Index()
+        pb_index.metadata.tool_info.name = "gzip-file"
+        doc = pb_index.documents.add()
+        doc.relative_path = "test.py"
+        path = tmp_path / "test.scip.gz"
+        path.write_bytes(gzip.compress(pb_index.SerializeToString()))
+
+        index = SCIPParser().parse_file(str(path))
+
+        assert index.metadata.tool_info.name == "gzip-file"
+        assert index.documents[0].relative_path == "test.py"
+
     def test_enable_indexing(self):
         """测试索引构建开关"""
         # 构造包含符号的数据
@@ -96,17 +117,58 @@ class TestSCIPParser:
         # 1. 启用索引 (默认)
         parser_on = SCIPParser(enable_indexing=True)
         index_on = parser_on.parse_bytes(data)
-        # 验证内部索引已构建
-        assert "test_symbol" in index_on._symbol_index
+        # 内部索引推迟到首次查询时构建
+        assert not index_on._idx.symbol_index
         assert len(index_on.get_symbol_occurrences("test_symbol")) == 1
+        assert "test_symbol" in index_on._idx.symbol_index
 
         # 2. 禁用索引
         parser_off = SCIPParser(enable_indexing=False)
         index_off = parser_off.parse_bytes(data)
         # 验证内部索引为空
-        assert "test_symbol" not in index_off._symbol_index
+        assert "test_symbol" not in index_off._idx.symbol_index
         assert len(index_off.get_symbol_occurrences("test_symbol")) == 0
 
+    def test_lazy_conversion_without_indexing(self):
+        """测试禁用索引时文档和出现位置按需转换"""
+        pb_index = scip_pb2.Index()
+        for i in range(3):
+            doc = pb_index.documents.add()
+            doc.relative_path = f"test{i}.py"
+            occ = doc.occurrences.add()
+            occ.symbol = f"symbol{i}"
+            occ.range.extend([i, 0, 5])
+
+        data = pb_index.SerializeToString()
+        eager = SCIPParser(enable_indexing=True).parse_bytes(data)
+        lazy = SCIPParser(enable_indexing=False).parse_bytes(data)
+
+        assert len(lazy.documents) == 3
+        # 未访问的元素尚未转换
+        assert lazy.documents._cache == [None, None, None]
+        assert lazy.documents[-1].relative_path == "test2.py"
+        assert lazy.documents[-1] is lazy.documents[2]
+        assert lazy.documents[2].occurrences[0].symbol == "symbol2"
+        assert [doc.relative_path for doc in lazy.documents[:2]] == ["test0.py", "test1.py"]
+        assert lazy.documents == eager.documents
+
+    def test_parallel_conversion(self):
+        """测试多进程文档转换与单进程结果一致"""
+        pb_index = scip_pb2.Index()
+        for i in range(80):
+            doc = pb_index.documents.add()
+            doc.relative_path = f"test{i}.py"
+            occ = doc.occurrences.add()
+            occ.symbol = f"symbol{i}"
+            occ.range.extend([i, 0, 5])
+
+        data = pb_index.SerializeToString()
+        serial = SCIPParser().parse_bytes(data)
+        parallel = SCIPParser(workers=2).parse_bytes(data)
+
+        assert parallel.documents == serial.documents
+        assert len(parallel.get_symbol_occurrences("symbol79")) == 1
+
     def test_symbol_info_fallback_display_name(self):
         """测试 display_name 为空时的 fallback"""
 
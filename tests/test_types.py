@@ -6,6 +6,7 @@ import pytest
 
 from scip_parser.core.types import (
     Descriptor,
+    Document,
     Occurrence,
     Package,
     SymbolKind,
@@ -69,6 +70,41 @@ def test_descriptor_suffix():
     assert desc_namespace.get_suffix_char() == "/"
 
 
+def test_descriptor_value_semantics():
+    """测试描述符的相等性、哈希与 slots 布局"""
+    a = Descriptor(name="foo", suffix=Descriptor.METHOD)
+    b = Descriptor(name="foo", suffix=Descriptor.METHOD)
+
+    assert a == b
+    assert hash(a) == hash(b)
+    assert len({a, b}) == 1
+    assert not hasattr(a, "__dict__")
+    # 后缀常量是类属性,不参与字段比较
+    assert Descriptor.METHOD == a.METHOD
+    assert repr(a) == "Descriptor(name='foo', disambiguator='', suffix=4)"
+    # 字符串形式只生成一次,且缓存不影响相等性
+    assert str(a) == "foo()."
+    assert str(a) is str(a)
+    assert a == b
+    # 相同描述符的不同实例共享同一个驻留字符串
+    assert str(b) is str(a)
+
+
+def test_descriptor_intern_table_is_bounded(monkeypatch):
+    """描述符驻留表写满时淘汰最早的一半"""
+    from scip_parser.core import types
+
+    monkeypatch.setattr(types, "_DESCRIPTOR_STRS", {})
+    monkeypatch.setattr(types, "_DESCRIPTOR_STRS_MAX_SIZE", 4)
+
+    for i in range(10):
+        str(Descriptor(name=f"name{i}", suffix=Descriptor.TERM))
+    assert len(types._DESCRIPTOR_STRS) <= 4
+    # 仍然返回正确的字符串,最近的描述符保留在表中
+    assert str(Descriptor(name="name9", suffix=Descriptor.TERM)) == "name9."
+    assert ("name9", "", Descriptor.TERM) in types._DESCRIPTOR_STRS
+
+
 def test_package_string_format():
     """测试 Package 字符串格式化"""
     pkg = Package(manager="npm", name="react", version="18.0.0")
@@ -100,6 +136,8 @@ def test_occurrence_three_element_range():
     assert occ.get_start_char() == 5
     assert occ.get_end_line() == 10  # 推断为与 start_line 相同
     assert occ.get_end_char() == 15
+    # 构造时补全为四元素形式
+    assert occ.range == (10, 5, 10, 15)
 
 
 def test_symbol_role_combinations():
@@ -134,5 +172,63 @@ def test_occurrence_with_all_roles():
     assert occ.is_read_access
 
 
+def test_document_get_symbol_at():
+    """测试按位置查找出现位置(含多行范围与重叠范围)"""
+    doc = Document(
+        relative_path="a.py",
+        language="python",
+        occurrences=[
+            Occurrence(range=(5, 0, 5, 4), symbol="late"),
+            Occurrence(range=(1, 0, 8, 2), symbol="block"),
+            Occurrence(range=(5, 2, 7), symbol="inner"),
+        ],
+        symbols={},
+    )
+
+    # 多个范围重叠时返回文档顺序中的第一个
+    assert doc.get_symbol_at(5, 3).symbol == "late"
+    assert doc.get_symbol_at(5, 6).symbol == "inner"
+    assert doc.get_symbol_at(3, 1).symbol == "block"
+    assert doc.get_symbol_at(9, 0) is None
+    assert doc.get_symbol_at(0, 0) is None
+
+
+def test_document_symbol_queries():
+    """测试文档内按符号查找出现位置与定义"""
+    ref = Occurrence(range=(0, 0, 3), symbol="foo")
+    definition = Occurrence(range=(2, 0, 3), symbol="foo", symbol_roles=SymbolRole.Definition)
+    other = Occurrence(range=(1, 0, 3), symbol="bar", symbol_roles=SymbolRole.Definition)
+    doc = Document(
+        relative_path="a.py",
+        language="python",
+        occurrences=(ref, other, definition),
+        symbols={},
+    )
+
+    assert doc.find_occurrences("foo") == [ref, definition]
+    assert doc.find_definition("foo") is definition
+    assert doc.find_definition("bar") is other
+    assert doc.find_occurrences("baz") == []
+    assert doc.find_definition("baz") is None
+
+
+def test_document_queries_skip_empty_ranges():
+    """测试 range 为空的出现位置不影响按符号与按位置的查询"""
+    empty = Occurrence(range=(), symbol="x")
+    occ = Occurrence(range=(1, 2, 3, 4), symbol="y")
+    doc = Document(
+        relative_path="a.py",
+        language="python",
+        occurrences=[empty, occ],
+        symbols={},
+    )
+
+    assert doc.find_occurrences("y") == [occ]
+    assert doc.find_occurrences("x") == [empty]
+    assert doc.find_definition("x") is None
+    assert doc.get_symbol_at(2, 3) is occ
+    assert doc.get_symbol_at(0, 0) is None
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])